@@ -406,8 +406,16 @@ function App() {
     }
   };
 
-  const handleExportCSV = (items?: ResearchItem[]) => {
-    const list = items ?? researchData;
+  const handleExportCSV = async (items?: ResearchItem[]) => {
+    let list = items ?? researchData;
+    // Summary rows (teacher lists) carry no content_json; fetch the full items for the funding/source columns
+    if (currentUser && list.some(item => item.content_json === undefined)) {
+      try {
+        const full = await researchAPI.getByUserId(currentUser.id as any, 'full');
+        const byId = new Map(full.map((item: any) => [item.id, item.content_json]));
+        list = list.map(item => byId.has(item.id) ? { ...item, content_json: byId.get(item.id) } as ResearchItem : item);
+      } catch (_) {}
+    }
     const headers = [
       "ID","标题","类别","负责人","日期","状态",
       "经费(万元)","来源","编号","参与角色","驳回原因","协作者"
@@ -1675,7 +1683,19 @@ const OperationLogTable = ({ logs }: { logs: AuditLog[] }) => (
   </div>
 );
 
-const ResearchDetailModal = ({ item, currentUser, onClose }: { item: ResearchItem, currentUser: User, onClose: () => void }) => {
+const ResearchDetailModal = ({ item: listItem, currentUser, onClose }: { item: ResearchItem, currentUser: User, onClose: () => void }) => {
+  // Summary list rows carry no content_json; load the full item when the modal opens
+  const [item, setItem] = useState<ResearchItem>(listItem);
+  useEffect(() => {
+    setItem(listItem);
+    if (listItem.content_json !== undefined) return;
+    let cancelled = false;
+    researchAPI.getById(listItem.id)
+      .then(full => { if (!cancelled) setItem({ ...listItem, content_json: full.content_json } as ResearchItem); })
+      .catch(() => {});
+    return () => { cancelled = true; };
+  }, [listItem]);
+
   const steps = [
     { label: '草稿', status: 'Draft', icon: FileText },
     { label: '审核中', status: 'Pending', icon: Clock },
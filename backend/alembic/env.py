@@ -1,7 +1,8 @@
+import asyncio
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -12,27 +13,22 @@ from app.core.config import settings
 # access to the values within the .ini file in use.
 config = context.config
 
-# Set the database URL from the loaded settings, but make it sync for Alembic
+# Set the database URL from the loaded settings; migrations run through the
+# same async driver as the app ("%" is escaped for the ini interpolation)
 db_url = settings.DATABASE_URL
-if db_url and "asyncmy" in db_url:
-    db_url = db_url.replace("+asyncmy", "+pymysql")
-
 if db_url:
-    config.set_main_option('sqlalchemy.url', db_url)
+    config.set_main_option('sqlalchemy.url', db_url.replace('%', '%%'))
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-if config.config_file_name is not None:
+# This line sets up loggers basically. Skipped when the app runs migrations
+# in-process so its own logging setup is left alone.
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.db.base import Base
-from app.models.user import User
-from app.models.research_type import ResearchType, ResearchSubtype
-from app.models.research_item import ResearchItem
-from app.models.research_collaborator import ResearchCollaborator
-from app.models.audit_log import AuditLog
+import app.models  # noqa: F401  registers every model on Base.metadata
 
 target_metadata = Base.metadata
 
@@ -56,21 +52,39 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode."""
-    connectable = engine_from_config(
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
 
-        with context.begin_transaction():
-            context.run_migrations()
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    The app's startup check passes its own (locked) connection in
+    config.attributes; the CLI opens one through the async engine.
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+    else:
+        asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
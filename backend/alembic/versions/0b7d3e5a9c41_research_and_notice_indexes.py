@@ -0,0 +1,36 @@
+"""research item, collaborator and notice recipient indexes
+
+Revision ID: 0b7d3e5a9c41
+Revises: f6a2d8e41b93
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7d3e5a9c41'
+down_revision: Union[str, None] = 'f6a2d8e41b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_research_items_user_id_id', 'research_items', ['user_id', 'id'], unique=False)
+    op.create_index('ix_research_items_status_id', 'research_items', ['status', 'id'], unique=False)
+    op.create_index('ix_research_items_subtype_id', 'research_items', ['subtype_id'], unique=False)
+    op.create_index('ix_research_collaborators_user_item', 'research_collaborators', ['user_id', 'item_id'], unique=False)
+    op.create_index('ix_research_collaborators_item_user', 'research_collaborators', ['item_id', 'user_id'], unique=False)
+    op.create_index('ix_notice_recipients_user_notice', 'notice_recipients', ['user_id', 'notice_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notice_recipients_user_notice', table_name='notice_recipients')
+    op.drop_index('ix_research_collaborators_item_user', table_name='research_collaborators')
+    op.drop_index('ix_research_collaborators_user_item', table_name='research_collaborators')
+    op.drop_index('ix_research_items_subtype_id', table_name='research_items')
+    op.drop_index('ix_research_items_status_id', table_name='research_items')
+    op.drop_index('ix_research_items_user_id_id', table_name='research_items')
@@ -0,0 +1,34 @@
+"""Audit log filter indexes
+
+Revision ID: a3c51e7d9f20
+Revises: b5e3f90a7c12
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c51e7d9f20'
+down_revision: Union[str, None] = 'b5e3f90a7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_audit_logs_created_at'), 'audit_logs', ['created_at'], unique=False)
+    op.create_index('ix_audit_logs_user_created', 'audit_logs', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_logs_action_created', 'audit_logs', ['action', 'created_at'], unique=False)
+    op.create_index('ix_audit_logs_target', 'audit_logs', ['target_type', 'target_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_logs_ip_created', 'audit_logs', ['ip', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_ip_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_target', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_action_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_user_created', table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_created_at'), table_name='audit_logs')
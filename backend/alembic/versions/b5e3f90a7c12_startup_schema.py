@@ -0,0 +1,172 @@
+"""Schema previously patched in at startup by main.ensure_mysql_role_column
+
+Revision ID: b5e3f90a7c12
+Revises: 517310327b3e
+Create Date: 2026-10-19 15:00:00.000000
+
+Databases that ran the old startup hook already have some or all of this,
+so every step checks the live schema first and the seed rows (see
+app.db.reference_data) are only inserted where their keys are not taken.
+
+It comes right after the initial migration because the later revisions index
+the tables and columns it creates. The downgrade leaves everything in place:
+most of it predates this revision on databases that ran the old hook.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.reference_data import seed_reference_rows
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e3f90a7c12'
+down_revision: Union[str, None] = '517310327b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_OPTS = dict(mysql_engine='InnoDB', mysql_default_charset='utf8mb4')
+
+
+def _user_columns():
+    return [
+        sa.Column('role', sa.String(length=50), server_default='teacher', nullable=True),
+        sa.Column('department', sa.String(length=255), nullable=True),
+        sa.Column('department_code', sa.String(length=50), nullable=True),
+        sa.Column('employee_id', sa.String(length=100), nullable=True),
+        sa.Column('gender', sa.String(length=20), nullable=True),
+        sa.Column('birth_date', sa.Date(), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('office_location', sa.String(length=255), nullable=True),
+        sa.Column('highest_education', sa.String(length=100), nullable=True),
+        sa.Column('degree', sa.String(length=100), nullable=True),
+        sa.Column('alma_mater', sa.String(length=255), nullable=True),
+        sa.Column('major', sa.String(length=255), nullable=True),
+        sa.Column('research_direction', sa.String(length=500), nullable=True),
+        sa.Column('advisor_qualification', sa.String(length=50), nullable=True),
+        sa.Column('profile_public', sa.Boolean(), server_default=sa.false(), nullable=True),
+    ]
+
+
+def _create_table(inspector, name, *columns):
+    if not inspector.has_table(name):
+        op.create_table(name, *columns, **TABLE_OPTS)
+        return True
+    return False
+
+
+def _add_columns(inspector, table, columns):
+    existing = {c['name'] for c in inspector.get_columns(table)}
+    added = []
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column)
+            added.append(column.name)
+    return added
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    added = _add_columns(inspector, 'users', _user_columns())
+    if 'role' in added:
+        users = sa.table('users', sa.column('role'), sa.column('is_superuser'))
+        op.execute(users.update().where(users.c.is_superuser == sa.true()).values(role='sys_admin'))
+        op.execute(users.update().where(users.c.is_superuser != sa.true()).values(role='teacher'))
+    _add_columns(inspector, 'research_types', [sa.Column('description', sa.String(length=1000), nullable=True)])
+
+    if not _create_table(inspector, 'notices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('content', sa.String(length=2000), nullable=False),
+        sa.Column('target_role', sa.String(length=50), nullable=False),
+        sa.Column('target_department', sa.String(length=255), nullable=True),
+        sa.Column('target_department_code', sa.String(length=50), nullable=True),
+        sa.Column('publisher', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ):
+        _add_columns(inspector, 'notices', [sa.Column('target_department_code', sa.String(length=50), nullable=True)])
+    if _create_table(inspector, 'notice_recipients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('notice_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), server_default=sa.false(), nullable=True),
+        sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ):
+        op.create_index('ix_notice_recipients_notice_id', 'notice_recipients', ['notice_id'], unique=False)
+        op.create_index('ix_notice_recipients_user_id', 'notice_recipients', ['user_id'], unique=False)
+    _create_table(inspector, 'departments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+        sa.UniqueConstraint('name'),
+    )
+    _create_table(inspector, 'department_aliases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('alias', sa.String(length=255), nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('alias'),
+    )
+    _create_table(inspector, 'backups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    _create_table(inspector, 'roles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('is_system', sa.Boolean(), server_default=sa.false(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    if _create_table(inspector, 'role_permissions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('role_id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ):
+        op.create_index('ix_role_permissions_role_id', 'role_permissions', ['role_id'], unique=False)
+    _create_table(inspector, 'permissions_catalog',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('module', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('enabled', sa.Boolean(), server_default=sa.true(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+    )
+    if _create_table(inspector, 'user_experiences',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=20), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=True),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('institution', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=2000), nullable=True),
+        sa.Column('order_index', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ):
+        op.create_index('ix_user_experiences_user_id', 'user_experiences', ['user_id'], unique=False)
+
+    # Shared with init_db.py, which builds fresh databases without the revisions
+    seed_reference_rows(op.get_bind())
+
+
+def downgrade() -> None:
+    # Tables, columns and seed rows may have been created by the old startup
+    # hook rather than by upgrade(), and user_roles references roles, so
+    # nothing here is dropped.
+    pass
@@ -0,0 +1,35 @@
+"""Grant research.stats.view to the research admin system role
+
+Revision ID: c3f8e0a2b6d4
+Revises: 0b7d3e5a9c41
+Create Date: 2026-10-20 10:00:00.000000
+
+The statistics endpoints now check research.stats.view through role
+permissions instead of allowing research_admin by role name, so the seeded
+科研管理员 role gets it to keep its access.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.reference_data import grant_system_permissions
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8e0a2b6d4'
+down_revision: Union[str, None] = '0b7d3e5a9c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # app.db.reference_data.SYSTEM_ROLE_GRANTS; init_db.py applies the same grants
+    grant_system_permissions(op.get_bind())
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "DELETE FROM role_permissions WHERE code = 'research.stats.view' AND role_id IN "
+        "(SELECT r.id FROM roles r WHERE r.is_system = :system AND r.name = '科研管理员')"
+    ).bindparams(system=True))
@@ -0,0 +1,26 @@
+"""Audit log hash chain column
+
+Revision ID: c81f4b2e6a57
+Revises: a3c51e7d9f20
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4b2e6a57'
+down_revision: Union[str, None] = 'a3c51e7d9f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('audit_logs', sa.Column('chain_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('audit_logs', 'chain_hash')
@@ -0,0 +1,39 @@
+"""Audit archive checkpoints
+
+Revision ID: d2a7c4e91f06
+Revises: c3f8e0a2b6d4
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c4e91f06'
+down_revision: Union[str, None] = 'c3f8e0a2b6d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('audit_archive_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.String(length=6), nullable=False),
+    sa.Column('mode', sa.String(length=20), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.Column('last_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_archive_checkpoints_id'), 'audit_archive_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_audit_archive_checkpoints_last_id'), 'audit_archive_checkpoints', ['last_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_audit_archive_checkpoints_last_id'), table_name='audit_archive_checkpoints')
+    op.drop_index(op.f('ix_audit_archive_checkpoints_id'), table_name='audit_archive_checkpoints')
+    op.drop_table('audit_archive_checkpoints')
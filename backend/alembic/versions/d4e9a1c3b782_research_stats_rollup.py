@@ -0,0 +1,40 @@
+"""Research statistics rollup table
+
+Revision ID: d4e9a1c3b782
+Revises: c81f4b2e6a57
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e9a1c3b782'
+down_revision: Union[str, None] = 'c81f4b2e6a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('research_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('department_code', sa.String(length=50), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('item_count', sa.Integer(), nullable=False),
+    sa.Column('funding_total', sa.Float(), nullable=False),
+    sa.Column('turnaround_count', sa.Integer(), nullable=False),
+    sa.Column('turnaround_seconds', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('department_code', 'category', 'status', 'year', name='uq_research_stats_key')
+    )
+    op.create_index(op.f('ix_research_stats_id'), 'research_stats', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_research_stats_id'), table_name='research_stats')
+    op.drop_table('research_stats')
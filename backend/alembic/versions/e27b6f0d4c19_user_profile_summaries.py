@@ -0,0 +1,40 @@
+"""Materialized user profile summaries
+
+Revision ID: e27b6f0d4c19
+Revises: d4e9a1c3b782
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27b6f0d4c19'
+down_revision: Union[str, None] = 'd4e9a1c3b782'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_profile_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('etag', sa.String(length=64), nullable=False),
+    sa.Column('is_public', sa.Boolean(), nullable=False),
+    sa.Column('department_code', sa.String(length=50), nullable=True),
+    sa.Column('document', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_user_profile_summaries_is_public'), 'user_profile_summaries', ['is_public'], unique=False)
+    op.create_index(op.f('ix_user_profile_summaries_department_code'), 'user_profile_summaries', ['department_code'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_profile_summaries_department_code'), table_name='user_profile_summaries')
+    op.drop_index(op.f('ix_user_profile_summaries_is_public'), table_name='user_profile_summaries')
+    op.drop_table('user_profile_summaries')
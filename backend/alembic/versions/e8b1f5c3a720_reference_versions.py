@@ -0,0 +1,30 @@
+"""Shared reference data versions
+
+Revision ID: e8b1f5c3a720
+Revises: d2a7c4e91f06
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b1f5c3a720'
+down_revision: Union[str, None] = 'd2a7c4e91f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reference_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('reference_versions')
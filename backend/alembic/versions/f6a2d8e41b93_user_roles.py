@@ -0,0 +1,48 @@
+"""user_roles association and user listing indexes
+
+Revision ID: f6a2d8e41b93
+Revises: e27b6f0d4c19
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a2d8e41b93'
+down_revision: Union[str, None] = 'e27b6f0d4c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_roles',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('role_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'role_id')
+    )
+    op.create_index('ix_user_roles_role_user', 'user_roles', ['role_id', 'user_id'], unique=False)
+    op.create_index('ix_users_role_id', 'users', ['role', 'id'], unique=False)
+    op.create_index('ix_users_department_code_id', 'users', ['department_code', 'id'], unique=False)
+    op.create_index('ix_users_is_active_id', 'users', ['is_active', 'id'], unique=False)
+    # Link existing users to the seeded system role matching their role string,
+    # by name among is_system roles: custom roles may hold the seed's ids
+    op.execute(sa.text(
+        "INSERT INTO user_roles (user_id, role_id) "
+        "SELECT u.id, r.id FROM users u JOIN roles r ON r.is_system = :system AND r.name = CASE u.role "
+        "WHEN 'sys_admin' THEN '系统管理员' WHEN 'research_admin' THEN '科研管理员' WHEN 'teacher' THEN '教师' END"
+    ).bindparams(system=True))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_is_active_id', table_name='users')
+    op.drop_index('ix_users_department_code_id', table_name='users')
+    op.drop_index('ix_users_role_id', table_name='users')
+    op.drop_index('ix_user_roles_role_user', table_name='user_roles')
+    op.drop_table('user_roles')
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from importlib import import_module
 
-from app.api.endpoints import login, users, research, notices, departments, logs, admin, rbac
+from fastapi import APIRouter, FastAPI
+
+from app.api.endpoints import login, users, research, notices, departments, stats
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -8,6 +10,36 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(research.router, prefix="/research", tags=["research"])
 api_router.include_router(notices.router, prefix="/notices", tags=["notices"])
 api_router.include_router(departments.router, prefix="/departments", tags=["departments"])
-api_router.include_router(logs.router, prefix="/logs", tags=["logs"])
-api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
-api_router.include_router(rbac.router, prefix="/rbac", tags=["rbac"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+
+# Admin consoles most workers never serve: imported and registered on the
+# first request under their prefix (or the first OpenAPI request)
+LAZY_ROUTERS = {
+    "/logs": ("app.api.endpoints.logs", ["logs"]),
+    "/admin": ("app.api.endpoints.admin", ["admin"]),
+    "/rbac": ("app.api.endpoints.rbac", ["rbac"]),
+}
+
+
+class LazyRouters:
+    """ASGI middleware that includes a LAZY_ROUTERS entry into `target` right before its first request is routed."""
+
+    def __init__(self, app, *, target: FastAPI, prefix: str):
+        self.app = app
+        self.target = target
+        self.prefix = prefix
+        self.pending = dict(LAZY_ROUTERS)
+
+    def load(self, key: str) -> None:
+        module, tags = self.pending.pop(key)
+        self.target.include_router(import_module(module).router, prefix=self.prefix + key, tags=tags)
+        self.target.openapi_schema = None
+
+    async def __call__(self, scope, receive, send):
+        if self.pending and scope["type"] == "http":
+            path = scope["path"]
+            for key in list(self.pending):
+                mount = self.prefix + key
+                if path == self.target.openapi_url or path == mount or path.startswith(mount + "/"):
+                    self.load(key)
+        await self.app(scope, receive, send)
@@ -1,6 +1,6 @@
 from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
@@ -8,9 +8,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import AsyncSessionLocal
+from app.db.replicas import STICKY_HEADER, replica_router
+from app.db.session import AsyncSessionLocal, read_session
 from app.models.user import User
 from app.crud import crud_user
+from app.services import rbac
+from app.services.audit import audit_sink
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/api/v1/login/access-token"
@@ -23,6 +26,30 @@ async def get_db() -> Generator[AsyncSession, None, None]:
         yield session
 
 
+async def get_uow(db: AsyncSession = Depends(get_db)) -> Generator[AsyncSession, None, None]:
+    """
+    Unit of work for write endpoints, declared with `scope="function"` so it
+    finishes before the response is sent: CRUD and service calls only flush,
+    and this commits once when the endpoint returns (with the audit entries it
+    staged) or rolls back when it raises. Shares get_db's session with the
+    auth dependencies.
+    """
+    try:
+        yield db
+    except Exception:
+        audit_sink.discard(db)
+        await db.rollback()
+        raise
+    await audit_sink.commit(db)
+
+
+async def get_read_db(request: Request) -> Generator[AsyncSession, None, None]:
+    """Dependency for read-only endpoints: a replica session when replicas are configured."""
+    session = await read_session(replica_router.reads_primary(request.headers.get(STICKY_HEADER)))
+    async with session:
+        yield session
+
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(reusable_oauth2)
@@ -49,6 +76,33 @@ async def get_current_user(
     return user
 
 
+async def get_token_user(
+    token: str = Depends(reusable_oauth2),
+) -> User:
+    """
+    Authenticated user built from JWT claims only, for endpoints that must be
+    able to answer without a database round trip (conditional GETs on shared
+    reference data). Does not see deactivation until the token expires.
+    """
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+        )
+        sub = payload.get("sub")
+        if sub is None:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
+    except (jwt.JWTError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    u = User(id=int(sub))
+    setattr(u, "role", payload.get("role") or "teacher")
+    setattr(u, "is_superuser", bool(payload.get("is_superuser", False)))
+    setattr(u, "is_active", True)
+    return u
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -103,3 +157,22 @@ async def get_current_active_auditor(
             detail="Could not validate credentials",
         )
 
+
+
+def require_permission(code: str):
+    """
+    Dependency factory: the current user must be a superuser or hold `code`
+    through one of their roles, checked against the compiled role -> permission map.
+    """
+    async def checker(
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(get_current_active_user),
+    ) -> User:
+        if current_user.is_superuser:
+            return current_user
+        granted = await rbac.role_permissions.get(db)
+        for role_id in await rbac.get_user_role_ids(db, current_user.id):
+            if code in granted.get(role_id, ()):
+                return current_user
+        raise HTTPException(status_code=400, detail="The user doesn't have enough privileges")
+    return checker
@@ -4,6 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import text
 from app.api import deps
+from app.db.replicas import replica_router
+from app.services.cache import reference_cache
+from app.services.compression import compression_stats
 
 router = APIRouter()
 
@@ -23,18 +26,17 @@ async def health(
         "disk": {"status": "warning", "metric": "85%", "message": "85% used (150GB free)"},
         "api": {"status": "ok", "metric": "120ms", "message": "Average response time"},
         "backup": {"status": "idle", "message": "Last backup successful"},
+        "replicas": replica_router.status(),
     }
 
 @router.post("/backup")
 async def start_backup(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     await db.execute(text("INSERT INTO backups (status) VALUES ('running')"))
-    await db.commit()
     # Simulate complete
     await db.execute(text("UPDATE backups SET status='success', updated_at=CURRENT_TIMESTAMP ORDER BY id DESC LIMIT 1"))
-    await db.commit()
     return {"status": "success"}
 
 @router.get("/backups")
@@ -48,7 +50,24 @@ async def list_backups(
 
 @router.post("/cache/clear")
 async def clear_cache(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return {"status": "cleared"}
+    """Flush the reference data cache and force every client to revalidate."""
+    cleared = await reference_cache.clear(db)
+    return {"status": "cleared", "namespaces": cleared, "stats": reference_cache.backend.stats()}
+
+@router.get("/metrics/compression")
+async def compression_metrics(
+    reset: bool = False,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Response bytes before and after compression per route since start (or the last reset)."""
+    routes = compression_stats.snapshot()
+    if reset:
+        compression_stats.reset()
+    return {
+        "bytesIn": sum(r["bytesIn"] for r in routes),
+        "bytesOut": sum(r["bytesOut"] for r in routes),
+        "routes": routes,
+    }
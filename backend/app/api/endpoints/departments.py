@@ -1,25 +1,40 @@
 from typing import List, Any
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.api import deps
-from app.models.department import Department, DepartmentAlias
+from app.models.department import Department
+from app.schemas.department import DepartmentBackfillStart, DepartmentSuggestBatch
+from app.services.departments import department_resolver
+from app.services.department_backfill import department_backfill
+from app.services.cache import reference_cache
+from app.services.compression import cached_json
+from app.services.http_cache import DEPARTMENTS, resource_versions
 
 router = APIRouter()
 
 @router.get("/", response_model=List[dict])
 async def list_departments(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_active_user),
+    current_user = Depends(deps.get_token_user),
 ) -> Any:
-    res = await db.execute(select(Department))
-    rows = res.scalars().all()
-    return [{"id": d.id, "code": d.code, "name": d.name} for d in rows]
+    version = await resource_versions.get(db, DEPARTMENTS)
+    not_modified = resource_versions.conditional(request, response, DEPARTMENTS, version)
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        res = await db.execute(select(Department))
+        return [{"id": d.id, "code": d.code, "name": d.name} for d in res.scalars().all()]
+
+    return await cached_json(request, response, DEPARTMENTS, "all", load, version=version)
 
 @router.post("/")
 async def create_department(
     body: dict,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     code = (body.get("code") or "").strip()
@@ -28,14 +43,15 @@ async def create_department(
         raise HTTPException(status_code=400, detail="code and name required")
     d = Department(code=code, name=name)
     db.add(d)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, DEPARTMENTS)
     return {"status": "ok"}
 
 @router.put("/{code}")
 async def update_department(
     code: str,
     body: dict,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     res = await db.execute(select(Department).where(Department.code == code))
@@ -46,13 +62,14 @@ async def update_department(
     if name:
         d.name = name
         db.add(d)
-        await db.commit()
+        await db.flush()
+        await reference_cache.invalidate_on_commit(db, DEPARTMENTS)
     return {"status": "ok"}
 
 @router.delete("/{code}")
 async def delete_department(
     code: str,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     res = await db.execute(select(Department).where(Department.code == code))
@@ -60,7 +77,8 @@ async def delete_department(
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
     await db.delete(d)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, DEPARTMENTS)
     return {"status": "ok"}
 @router.get("/normalize")
 async def normalize_department(
@@ -68,22 +86,41 @@ async def normalize_department(
     db: AsyncSession = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user),
 ) -> Any:
-    def norm(s: str) -> str:
-        return (s or "").strip().lower().replace(" ", "")
-    n = norm(name)
-    # Match name
-    res = await db.execute(select(Department))
-    for d in res.scalars().all():
-        if norm(d.name) == n:
-            return {"code": d.code, "name": d.name}
-    # Match aliases
-    res2 = await db.execute(select(DepartmentAlias))
-    for a in res2.scalars().all():
-        if norm(a.alias) == n:
-            # resolve code
-            res3 = await db.execute(select(Department).where(Department.code == a.code))
-            d = res3.scalars().first()
-            if d:
-                return {"code": d.code, "name": d.name}
-            return {"code": a.code}
-    return {"code": None}
+    return await department_resolver.lookup(db, name)
+
+@router.get("/suggest")
+async def suggest_department(
+    q: str = Query(..., description="院系名称（可不完整）"),
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user),
+) -> Any:
+    return await department_resolver.suggest(db, q, limit=limit)
+
+@router.post("/suggest/batch")
+async def suggest_departments_batch(
+    body: DepartmentSuggestBatch,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return await department_resolver.suggest_many(
+        db, [n or "" for n in body.names], min_score=body.min_score
+    )
+
+@router.post("/backfill")
+async def start_department_backfill(
+    body: DepartmentBackfillStart,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Resolve users.department_code from users.department in chunks (dryRun only reports)."""
+    if department_backfill.running:
+        raise HTTPException(status_code=409, detail="Backfill already running")
+    return department_backfill.start(
+        dry_run=body.dry_run, chunk_size=body.chunk_size, overwrite=body.overwrite
+    )
+
+@router.get("/backfill")
+async def get_department_backfill(
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return department_backfill.state
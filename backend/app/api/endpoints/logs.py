@@ -1,45 +1,259 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.api import deps
+from app.core.config import settings
+from app.crud.crud_audit_log import audit_log as crud_audit_log
+from app.db.session import AsyncSessionLocal
 from app.models.audit_log import AuditLog
 from app.models.user import User
+from app.schemas.audit_log import AuditArchiveRequest
+from app.services import audit_chain
+from app.services.audit_archive import archive_audit_logs
 
 router = APIRouter()
 
+
+def _log_to_dict(l: AuditLog, full_name: Optional[str]) -> dict:
+    operator = full_name or (f"用户#{l.user_id}" if getattr(l, "user_id", None) else "-")
+    diff = None
+    if getattr(l, "old_value", None) is not None or getattr(l, "new_value", None) is not None:
+        diff = {"oldValue": getattr(l, "old_value", None), "newValue": getattr(l, "new_value", None)}
+    return {
+        "id": str(l.id),
+        "operatorName": operator,
+        "action": getattr(l, "action", ""),
+        "targetType": getattr(l, "target_type", None) or "",
+        "targetId": str(l.target_id) if getattr(l, "target_id", None) is not None else "",
+        "timestamp": l.created_at.isoformat() if getattr(l, "created_at", None) else "",
+        "ip": getattr(l, "ip", "") or "",
+        "diff": diff,
+    }
+
+
+async def _query_logs(
+    db: AsyncSession,
+    response: Response,
+    *,
+    operator_id: Optional[int] = None,
+    action: Optional[str] = None,
+    target_type: Optional[str] = None,
+    target_id: Optional[int] = None,
+    ip: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[dict]:
+    """
+    Filtered audit log page, newest first. Every filter is an equality on the
+    leading column of an (x, created_at) index so the range and ordering come
+    from the same index. Pass the X-Next-Cursor header back as `cursor` to page
+    without OFFSET.
+    """
+    stmt = select(AuditLog, User.full_name).outerjoin(User, User.id == AuditLog.user_id)
+    if operator_id is not None:
+        stmt = stmt.where(AuditLog.user_id == operator_id)
+    if action:
+        stmt = stmt.where(AuditLog.action == action)
+    if target_type:
+        stmt = stmt.where(AuditLog.target_type == target_type)
+    if target_id is not None:
+        stmt = stmt.where(AuditLog.target_id == target_id)
+    if ip:
+        stmt = stmt.where(AuditLog.ip == ip)
+    if start is not None:
+        stmt = stmt.where(AuditLog.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(AuditLog.created_at < end)
+    if cursor:
+        try:
+            ts, _, last_id = cursor.rpartition("_")
+            ts, last_id = datetime.fromisoformat(ts), int(last_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(
+            (AuditLog.created_at < ts) | ((AuditLog.created_at == ts) & (AuditLog.id < last_id))
+        )
+        skip = 0
+    stmt = stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).offset(skip).limit(limit)
+    rows = (await db.execute(stmt)).all()
+    if len(rows) == limit and rows[-1][0].created_at is not None:
+        last = rows[-1][0]
+        response.headers["X-Next-Cursor"] = f"{last.created_at.isoformat()}_{last.id}"
+    return [_log_to_dict(l, full_name) for l, full_name in rows]
+
+
 @router.get("/", response_model=List[dict])
 @router.get("", response_model=List[dict])
 async def list_logs(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user = Depends(deps.get_current_active_user),
+    operator_id: Optional[int] = Query(None, alias="operatorId"),
+    action: Optional[str] = None,
+    target_type: Optional[str] = Query(None, alias="targetType"),
+    target_id: Optional[int] = Query(None, alias="targetId"),
+    ip: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
 ) -> Any:
-    stmt = (
-        select(AuditLog, User.full_name)
-        .outerjoin(User, User.id == AuditLog.user_id)
-        .order_by(AuditLog.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    return await _query_logs(
+        db, response, operator_id=operator_id, action=action, target_type=target_type,
+        target_id=target_id, ip=ip, start=start, end=end, cursor=cursor, skip=skip, limit=limit,
     )
-    res = await db.execute(stmt)
-    rows = res.all()
-    out: List[dict] = []
-    for l, full_name in rows:
-        operator = full_name or (f"用户#{l.user_id}" if getattr(l, "user_id", None) else "-")
-        diff = None
-        if getattr(l, "old_value", None) is not None or getattr(l, "new_value", None) is not None:
-            diff = {"oldValue": getattr(l, "old_value", None), "newValue": getattr(l, "new_value", None)}
-        out.append(
-            {
-                "id": str(l.id),
-                "operatorName": operator,
-                "action": getattr(l, "action", ""),
-                "targetId": str(l.target_id) if getattr(l, "target_id", None) is not None else "",
-                "timestamp": l.created_at.isoformat() if getattr(l, "created_at", None) else "",
-                "ip": getattr(l, "ip", "") or "",
-                "diff": diff,
-            }
-        )
-    return out
+
+@router.get("/target/{target_id}", response_model=List[dict])
+async def list_logs_by_target(
+    target_id: int,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user = Depends(deps.get_current_active_superuser),
+    target_type: str = Query("research_item", alias="targetType"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+) -> Any:
+    return await _query_logs(
+        db, response, target_type=target_type, target_id=target_id, cursor=cursor, limit=limit
+    )
+
+@router.get("/action/{action}", response_model=List[dict])
+async def list_logs_by_action(
+    action: str,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user = Depends(deps.get_current_active_superuser),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+) -> Any:
+    return await _query_logs(db, response, action=action, cursor=cursor, limit=limit)
+
+@router.post("/archive")
+async def archive_logs(
+    body: AuditArchiveRequest,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Move audit rows older than the retention window into monthly archives."""
+    months = body.older_than_months or settings.AUDIT_RETENTION_MONTHS
+    mode = body.mode or settings.AUDIT_ARCHIVE_MODE
+    report = await archive_audit_logs(db, older_than_months=months, mode=mode, dry_run=body.dry_run)
+    return {"mode": mode, "olderThanMonths": months, "months": report}
+
+
+EXPORT_COLUMNS = [c.name for c in AuditLog.__table__.columns]
+
+
+def _export_value(v: Any) -> Any:
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return v
+
+
+def _segment(start_id: Optional[int], end_id: Optional[int], start: Optional[datetime], end: Optional[datetime]) -> list:
+    """Filter conditions selecting an export/verify segment."""
+    conds = []
+    if start_id is not None:
+        conds.append(AuditLog.id >= start_id)
+    if end_id is not None:
+        conds.append(AuditLog.id <= end_id)
+    if start is not None:
+        conds.append(AuditLog.created_at >= start)
+    if end is not None:
+        conds.append(AuditLog.created_at < end)
+    return conds
+
+
+def _segment_rows(conds: list):
+    return select(AuditLog.__table__).where(*conds).order_by(AuditLog.id).execution_options(yield_per=1000)
+
+
+async def _stream_rows(stmt) -> AsyncIterator[dict]:
+    # Own session: the stream outlives the request's dependency-scoped one
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for row in result.mappings():
+            yield dict(row)
+
+
+@router.get("/export")
+async def export_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    start_id: Optional[int] = Query(None, alias="startId"),
+    end_id: Optional[int] = Query(None, alias="endId"),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stream audit rows in id order through a server-side cursor as NDJSON or CSV.
+    X-Chain-Prev carries the chain hash preceding the segment so it can be
+    verified on its own.
+    """
+    conds = _segment(start_id, end_id, start, end)
+    stmt = _segment_rows(conds)
+    first_id = (await db.execute(select(func.min(AuditLog.id)).where(*conds))).scalar()
+    prev = await crud_audit_log.last_hash(db, before_id=first_id) if first_id is not None else None
+
+    async def ndjson() -> AsyncIterator[str]:
+        async for row in _stream_rows(stmt):
+            yield json.dumps({k: _export_value(v) for k, v in row.items()}, ensure_ascii=False) + "\n"
+
+    async def as_csv() -> AsyncIterator[str]:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_COLUMNS)
+        async for row in _stream_rows(stmt):
+            writer.writerow([
+                json.dumps(row[c], ensure_ascii=False) if isinstance(row[c], (dict, list)) else _export_value(row[c])
+                for c in EXPORT_COLUMNS
+            ])
+            if buf.tell() > 64 * 1024:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    headers = {
+        "Content-Disposition": f'attachment; filename="audit_logs_{stamp}.{format}"',
+        "X-Chain-Prev": prev or "",
+    }
+    if format == "csv":
+        return StreamingResponse(as_csv(), media_type="text/csv; charset=utf-8", headers=headers)
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", headers=headers)
+
+@router.get("/verify")
+async def verify_logs(
+    start_id: Optional[int] = Query(None, alias="startId"),
+    end_id: Optional[int] = Query(None, alias="endId"),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Recompute the hash chain over an id range, starting from the hash just
+    before it (the archive checkpoint when earlier rows have been archived).
+    """
+    conds = _segment(start_id, end_id, None, None) + [AuditLog.chain_hash.is_not(None)]
+    stmt = _segment_rows(conds)
+    first_id = (await db.execute(select(func.min(AuditLog.id)).where(*conds))).scalar()
+    prev = await crud_audit_log.last_hash(db, before_id=first_id) if first_id is not None else None
+    ok, checked, bad_id = True, 0, None
+    async for row in _stream_rows(stmt):
+        ok, n, bad_id, prev = audit_chain.verify(prev, [row])
+        checked += n
+        if not ok:
+            break
+    return {"ok": ok, "checked": checked, "firstMismatchId": bad_id, "lastHash": prev}
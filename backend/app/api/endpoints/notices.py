@@ -1,15 +1,17 @@
 from typing import List, Any
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.api import deps
 from app.models.notice import Notice as NoticeModel
-from app.models.department import Department, DepartmentAlias
 from app.models.notice_recipient import NoticeRecipient
 from app.models.user import User
-from app.schemas.notice import NoticeCreate, Notice as NoticeSchema
+from app.schemas.notice import NoticeCreate, NoticeReadBatch, Notice as NoticeSchema
 from app.crud.base import CRUDBase
+from app.crud import crud_notice_recipient
+from app.services.departments import department_resolver
+from app.services.read_receipts import read_receipts
 
 router = APIRouter()
 
@@ -18,28 +20,15 @@ crud_notice = CRUDBase[NoticeModel, NoticeCreate, NoticeCreate](NoticeModel)
 @router.post("/", response_model=NoticeSchema, status_code=status.HTTP_201_CREATED)
 async def create_notice(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     notice_in: NoticeCreate,
     current_user = Depends(deps.get_current_active_auditor),
 ) -> Any:
     # Normalize department
     code = notice_in.target_department_code
     name = notice_in.target_department
-    async def norm(s: str) -> str:
-        return (s or "").strip().lower().replace(" ", "")
     if not code and name:
-        # Try match by name
-        res = await db.execute(select(Department))
-        for d in res.scalars().all():
-            if norm(d.name) == norm(name):
-                code = d.code
-                break
-        if not code:
-            res2 = await db.execute(select(DepartmentAlias))
-            for a in res2.scalars().all():
-                if norm(a.alias) == norm(name):
-                    code = a.code
-                    break
+        code = await department_resolver.resolve(db, name)
     payload = NoticeCreate(
         title=notice_in.title,
         content=notice_in.content,
@@ -69,32 +58,19 @@ async def create_notice(
         recs.append(NoticeRecipient(notice_id=created.id, user_id=u.id))
     if recs:
         db.add_all(recs)
-        await db.commit()
     return created
 
 @router.post("", response_model=NoticeSchema, status_code=status.HTTP_201_CREATED)
 async def create_notice_no_slash(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     notice_in: NoticeCreate,
     current_user = Depends(deps.get_current_active_auditor),
 ) -> Any:
     code = notice_in.target_department_code
     name = notice_in.target_department
-    def norm(s: str) -> str:
-        return (s or "").strip().lower().replace(" ", "")
     if not code and name:
-        res = await db.execute(select(Department))
-        for d in res.scalars().all():
-            if norm(d.name) == norm(name):
-                code = d.code
-                break
-        if not code:
-            res2 = await db.execute(select(DepartmentAlias))
-            for a in res2.scalars().all():
-                if norm(a.alias) == norm(name):
-                    code = a.code
-                    break
+        code = await department_resolver.resolve(db, name)
     payload = NoticeCreate(
         title=notice_in.title,
         content=notice_in.content,
@@ -116,7 +92,6 @@ async def create_notice_no_slash(
         recs.append(NoticeRecipient(notice_id=created.id, user_id=u.id))
     if recs:
         db.add_all(recs)
-        await db.commit()
     return created
 @router.get("/", response_model=List[NoticeSchema])
 async def list_notices(
@@ -136,19 +111,33 @@ async def list_my_notices(
     res = await db.execute(select(NoticeModel).join(NoticeRecipient, NoticeRecipient.notice_id == NoticeModel.id).where(NoticeRecipient.user_id == current_user.id))
     return res.scalars().all()
 
+@router.put("/read")
+async def mark_notices_read(
+    body: NoticeReadBatch,
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
+    current_user = Depends(deps.get_current_active_user),
+) -> Any:
+    """Mark many notices as read in one UPDATE, by id list or by receipt time."""
+    if body.ids is None and body.all_before is None:
+        raise HTTPException(status_code=400, detail="ids or allBefore required")
+    if body.ids is not None and not body.ids:
+        return {"status": "ok", "updated": 0}
+    updated = await crud_notice_recipient.notice_recipient.mark_read_multi(
+        db, user_id=current_user.id, notice_ids=body.ids, before=body.all_before
+    )
+    return {"status": "ok", "updated": updated}
+
 @router.put("/{notice_id}/read")
 async def mark_notice_read(
     notice_id: int,
     db: AsyncSession = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user),
 ) -> Any:
-    res = await db.execute(select(NoticeRecipient).where(NoticeRecipient.notice_id == notice_id, NoticeRecipient.user_id == current_user.id))
-    rec = res.scalars().first()
-    if rec:
-        rec.is_read = True
-        from datetime import datetime
-        rec.read_at = datetime.utcnow()
-        db.add(rec)
-        await db.commit()
-        return {"status": "ok"}
-    return {"status": "ignored"}
+    res = await db.execute(select(NoticeRecipient.id, NoticeRecipient.is_read).where(NoticeRecipient.notice_id == notice_id, NoticeRecipient.user_id == current_user.id))
+    rec = res.first()
+    if rec is None:
+        return {"status": "ignored"}
+    # Only the UPDATE is buffered: bursts of clicks are written as one UPDATE per user
+    if not rec.is_read:
+        read_receipts.add(current_user.id, notice_id)
+    return {"status": "ok"}
@@ -1,27 +1,57 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 from app.api import deps
-from app.models.rbac import Role, RolePermission
+from app.models.rbac import Role, RolePermission, UserRole
 from app.models.permission_catalog import PermissionCatalog
 from app.schemas.rbac import RoleCreate, RoleUpdate, RoleResponse, RolePermissionsUpdate
+from app.services.cache import reference_cache
+from app.services.compression import cached_json
+from app.services.http_cache import PERMISSIONS, ROLES, resource_versions
 
 router = APIRouter()
 
+
+def _role_response(r: Role, codes=None) -> RoleResponse:
+    if codes is None:
+        codes = [p.code for p in r.permissions]
+    return RoleResponse(id=r.id, name=r.name, description=r.description, is_system=r.is_system, created_at=r.created_at, permissions=codes)
+
+
+async def _get_role(db: AsyncSession, role_id: int) -> Optional[Role]:
+    """Role with its permissions loaded, refreshing any copy already in the session."""
+    res = await db.execute(
+        select(Role).options(selectinload(Role.permissions)).where(Role.id == role_id)
+        .execution_options(populate_existing=True)
+    )
+    return res.scalars().first()
+
 @router.get("/permissions")
 async def list_permissions(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_active_user),
+    current_user = Depends(deps.get_token_user),
 ) -> Any:
-    res = await db.execute(select(PermissionCatalog))
-    rows = res.scalars().all()
-    return [{"id": p.id, "code": p.code, "name": p.name, "module": p.module, "description": p.description, "enabled": p.enabled} for p in rows]
+    version = await resource_versions.get(db, PERMISSIONS)
+    not_modified = resource_versions.conditional(request, response, PERMISSIONS, version)
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        res = await db.execute(select(PermissionCatalog))
+        rows = res.scalars().all()
+        return [{"id": p.id, "code": p.code, "name": p.name, "module": p.module, "description": p.description, "enabled": p.enabled} for p in rows]
+
+    return await cached_json(request, response, PERMISSIONS, "all", load, version=version)
 
 @router.post("/permissions")
 async def create_permission(
     body: dict,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     code = (body.get("code") or "").strip()
@@ -32,7 +62,8 @@ async def create_permission(
         raise HTTPException(status_code=400, detail="code, name, module required")
     p = PermissionCatalog(code=code, name=name, module=module, description=description)
     db.add(p)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, PERMISSIONS)
     await db.refresh(p)
     return {"id": p.id, "code": p.code, "name": p.name, "module": p.module, "description": p.description, "enabled": p.enabled}
 
@@ -40,7 +71,7 @@ async def create_permission(
 async def update_permission(
     perm_id: int,
     body: dict,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     res = await db.execute(select(PermissionCatalog).where(PermissionCatalog.id == perm_id))
@@ -52,14 +83,15 @@ async def update_permission(
     if "description" in body: p.description = body.get("description")
     if "enabled" in body: p.enabled = bool(body.get("enabled"))
     db.add(p)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, PERMISSIONS)
     await db.refresh(p)
     return {"id": p.id, "code": p.code, "name": p.name, "module": p.module, "description": p.description, "enabled": p.enabled}
 
 @router.delete("/permissions/{perm_id}")
 async def delete_permission(
     perm_id: int,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     res = await db.execute(select(PermissionCatalog).where(PermissionCatalog.id == perm_id))
@@ -67,58 +99,66 @@ async def delete_permission(
     if not p:
         raise HTTPException(status_code=404, detail="Not found")
     await db.delete(p)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, PERMISSIONS)
     return {"status": "ok"}
 @router.get("/roles", response_model=List[RoleResponse])
 async def list_roles(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_active_user),
+    current_user = Depends(deps.get_token_user),
 ) -> Any:
-    res = await db.execute(select(Role))
-    roles = res.scalars().all()
-    out = []
-    for r in roles:
-        codes = [p.code for p in r.permissions]
-        out.append(RoleResponse(id=r.id, name=r.name, description=r.description, is_system=r.is_system, created_at=r.created_at, permissions=codes))
-    return out
+    version = await resource_versions.get(db, ROLES)
+    not_modified = resource_versions.conditional(request, response, ROLES, version)
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        res = await db.execute(select(Role).options(selectinload(Role.permissions)).order_by(Role.id))
+        return [_role_response(r).model_dump() for r in res.scalars().all()]
+
+    return await cached_json(request, response, ROLES, "all", load, schema=List[RoleResponse], version=version)
 
 @router.post("/roles", response_model=RoleResponse, status_code=status.HTTP_201_CREATED)
 async def create_role(
     body: RoleCreate,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     r = Role(name=body.name, description=body.description, is_system=bool(body.is_system))
     db.add(r)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, ROLES)
     await db.refresh(r)
-    return RoleResponse(id=r.id, name=r.name, description=r.description, is_system=r.is_system, created_at=r.created_at, permissions=[])
+    return _role_response(r, [])
 
 @router.put("/roles/{role_id}", response_model=RoleResponse)
 async def update_role(
     role_id: int,
     body: RoleUpdate,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    res = await db.execute(select(Role).where(Role.id == role_id))
-    r = res.scalars().first()
+    r = await _get_role(db, role_id)
     if not r:
         raise HTTPException(status_code=404, detail="Role not found")
-    if body.name is not None:
+    if body.name is not None and body.name != r.name:
+        if r.is_system:
+            # users.role is linked to system roles by name (reference_data.SYSTEM_ROLE_NAMES)
+            raise HTTPException(status_code=400, detail="Cannot rename system role")
         r.name = body.name
     if body.description is not None:
         r.description = body.description
     db.add(r)
-    await db.commit()
-    await db.refresh(r)
-    codes = [p.code for p in r.permissions]
-    return RoleResponse(id=r.id, name=r.name, description=r.description, is_system=r.is_system, created_at=r.created_at, permissions=codes)
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, ROLES)
+    return _role_response(r)
 
 @router.delete("/roles/{role_id}")
 async def delete_role(
     role_id: int,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     res = await db.execute(select(Role).where(Role.id == role_id))
@@ -127,28 +167,28 @@ async def delete_role(
         raise HTTPException(status_code=404, detail="Role not found")
     if r.is_system:
         raise HTTPException(status_code=400, detail="Cannot delete system role")
+    await db.execute(delete(UserRole).where(UserRole.role_id == role_id))
     await db.delete(r)
-    await db.commit()
+    await db.flush()
+    await reference_cache.invalidate_on_commit(db, ROLES)
     return {"status": "ok"}
 
 @router.put("/roles/{role_id}/permissions", response_model=RoleResponse)
 async def save_role_permissions(
     role_id: int,
     body: RolePermissionsUpdate,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
+    """Replace a role's permissions in one transaction: one DELETE, one multi-row INSERT."""
     res = await db.execute(select(Role).where(Role.id == role_id))
     r = res.scalars().first()
     if not r:
         raise HTTPException(status_code=404, detail="Role not found")
-    await db.execute(select(RolePermission).where(RolePermission.role_id == role_id))
-    for p in list(r.permissions):
-        await db.delete(p)
-    await db.commit()
-    new_perms = [RolePermission(role_id=role_id, code=c) for c in set(body.codes or [])]
-    db.add_all(new_perms)
-    await db.commit()
-    await db.refresh(r)
-    codes = [p.code for p in r.permissions]
-    return RoleResponse(id=r.id, name=r.name, description=r.description, is_system=r.is_system, created_at=r.created_at, permissions=codes)
+    codes = sorted(set(body.codes or []))
+    await db.execute(delete(RolePermission).where(RolePermission.role_id == role_id))
+    if codes:
+        await db.execute(insert(RolePermission), [{"role_id": role_id, "code": c} for c in codes])
+    # Also clears role_permissions (an invalidation hook on ROLES); it reloads on next use
+    await reference_cache.invalidate_on_commit(db, ROLES)
+    return _role_response(r, codes)
@@ -1,20 +1,31 @@
-from typing import List, Any
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.api import deps
-from app.crud import crud_research_item, crud_audit_log
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields, projected_response
+from app.crud import crud_research_item
 from app.models.user import User
-from app.models.research_item import ApprovalStatus
-from app.models.research_type import ResearchSubtype
+from app.models.research_item import ApprovalStatus, ResearchItem, subtype_category
+from app.models.research_type import ResearchSubtype, ResearchType
 from app.models.research_collaborator import ResearchCollaborator
-from app.schemas.research import ResearchItemCreate, ResearchItemResponse, ResearchItemUpdate
+from app.schemas.base import CamelModel
+from app.schemas.research import (
+    ResearchItemCreate, ResearchItemResponse, ResearchItemSummary, ResearchItemUpdate,
+    UserResearchItem, UserResearchItemSummary,
+)
 from app.schemas.research_status import ResearchItemStatusUpdate, ResearchItemBatchStatusUpdate
 from app.schemas.audit_log import AuditLogCreate
 from app.schemas.research_type import ResearchSubtype as ResearchSubtypeSchema
+from app.services.audit import audit_sink
+from app.services import item_history, profile_summaries, research_stats
+from app.services.cache import reference_cache
+from app.services.compression import cached_json
+from app.services.http_cache import RESEARCH_SUBTYPES, resource_versions
 from sqlalchemy import or_
 
 router = APIRouter()
@@ -23,7 +34,7 @@ router = APIRouter()
 @router.post("/", response_model=ResearchItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_research_item(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     item_in: ResearchItemCreate,
     current_user: User = Depends(deps.get_current_active_user),
     request: Request
@@ -32,60 +43,128 @@ async def create_research_item(
     new_item = await crud_research_item.research_item.create_with_owner(
         db=db, obj_in=item_in, owner_id=current_user.id
     )
+    await research_stats.apply(db, {}, await research_stats.contributions(db, [new_item.id]))
+    await profile_summaries.refresh_research(db, await profile_summaries.users_for_items(db, [new_item.id]))
     log_entry = AuditLogCreate(
         user_id=current_user.id,
-        action='创建科研项目',
-        target_type='research_item',
+        action=item_history.CREATE_ACTION,
+        target_type=item_history.TARGET_TYPE,
         target_id=new_item.id,
-        new_value=item_in.model_dump(),
+        new_value={**item_history.snapshot(new_item), "team_members": item_in.team_members},
         ip=request.client.host
     )
-    await crud_audit_log.audit_log.create(db, obj_in=log_entry)
-    return new_item
+    await audit_sink.record(db, log_entry, critical=True)
+    return await crud_research_item.research_item.get_with_subtype(db, new_item.id)
+
+
+def item_view(
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: no contentJson, adds ownerName"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+) -> Tuple[Type[CamelModel], List[str]]:
+    """Schema of a research list (full items or summaries) and the fields to project from it."""
+    return _view_fields(ResearchItemSummary if view == "summary" else ResearchItemResponse, fields)
+
+
+def user_item_view(
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: no contentJson, adds ownerName"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+) -> Tuple[Type[CamelModel], List[str]]:
+    """item_view for a user's research list, whose rows also carry `relation`."""
+    return _view_fields(UserResearchItemSummary if view == "summary" else UserResearchItem, fields)
+
+
+def _view_fields(schema: Type[CamelModel], fields: Optional[str]) -> Tuple[Type[CamelModel], List[str]]:
+    return schema, parse_fields(fields, schema) or list(schema.model_fields)
+
+
+async def _list_items(
+    db: AsyncSession,
+    response: Response,
+    stmt,
+    view: Tuple[Type[CamelModel], List[str]],
+    skip: int,
+    limit: int,
+    extra: Optional[Dict[str, Any]] = None,
+    next_cursor: bool = False,
+) -> Response:
+    """
+    Run a filtered `select(ResearchItem)` as a single query projecting just the
+    view's fields and serialize the rows directly. `category` comes from the
+    subtype and type names and `owner_name` from users, through outer joins of
+    aliases so they do not clash with joins already in `stmt`. `extra` maps
+    other field names to columns of `stmt`'s joins. With `next_cursor`, a full
+    page sets X-Next-Cursor to its last id.
+    """
+    schema, names = view
+    extra = extra or {}
+    cols = [getattr(ResearchItem, n) for n in names if n not in ("category", "owner_name") and n not in extra]
+    cols += [col.label(n) for n, col in extra.items() if n in names]
+    if "owner_name" in names:
+        owner = aliased(User)
+        cols.append(owner.full_name.label("owner_name"))
+        stmt = stmt.outerjoin(owner, owner.id == ResearchItem.user_id)
+    if "category" in names:
+        sub, typ = aliased(ResearchSubtype), aliased(ResearchType)
+        cols += [sub.name.label("subtype_name"), typ.name.label("type_name")]
+        stmt = (
+            stmt.outerjoin(sub, sub.id == ResearchItem.subtype_id)
+            .outerjoin(typ, typ.id == sub.type_id)
+        )
+    stmt = stmt.with_only_columns(*cols).order_by(ResearchItem.id).offset(skip).limit(limit)
+    rows = (await db.execute(stmt)).mappings().all()
+    if next_cursor and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    if "category" in names:
+        rows = [{**r, "category": subtype_category(r["subtype_name"], r["type_name"])} for r in rows]
+    return projected_response(rows, names, schema, response)
+
 
+def _category_filter(category: str):
+    if category == '纵向项目':
+        return ResearchSubtype.name.like('%纵向%')
+    elif category == '横向项目':
+        return ResearchSubtype.name.like('%横向%')
+    elif category == '学术论文':
+        return ResearchSubtype.name.like('%论文%')
+    elif category == '出版著作':
+        return or_(ResearchSubtype.name.like('%出版%'), ResearchSubtype.name.like('%著作%'))
+    elif category == '专利':
+        return or_(ResearchSubtype.name.like('%专利%'), ResearchSubtype.name.like('%发明%'))
+    elif category == '科技奖励':
+        return or_(ResearchSubtype.name.like('%奖励%'), ResearchSubtype.name.like('%获奖%'))
+    return None
 
-@router.get("/pending", response_model=List[ResearchItemResponse])
+
+@router.get("/pending", response_model=List[Union[ResearchItemResponse, ResearchItemSummary]])
 async def read_pending_research_items(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    view: Tuple[Type[CamelModel], List[str]] = Depends(item_view),
     current_user: User = Depends(deps.get_current_active_auditor),
 ) -> Any:
     """Retrieve pending research items for approval."""
-    result = await db.execute(
-        select(crud_research_item.research_item.model)
-        .options(
-            selectinload(crud_research_item.research_item.model.subtype).selectinload(ResearchSubtype.type)
-        )
-        .filter(crud_research_item.research_item.model.status == ApprovalStatus.pending)
-        .offset(skip).limit(limit)
-    )
-    items = result.scalars().all()
-    return items
+    stmt = select(ResearchItem).where(ResearchItem.status == ApprovalStatus.pending)
+    return await _list_items(db, response, stmt, view, skip, limit)
 
 
-@router.get("/", response_model=List[ResearchItemResponse])
+@router.get("/", response_model=List[Union[ResearchItemResponse, ResearchItemSummary]])
 async def read_research_items(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    view: Tuple[Type[CamelModel], List[str]] = Depends(item_view),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Retrieve research items for the current user."""
-    result = await db.execute(
-        select(crud_research_item.research_item.model)
-        .options(
-            selectinload(crud_research_item.research_item.model.subtype).selectinload(ResearchSubtype.type)
-        )
-        .filter(crud_research_item.research_item.model.user_id == current_user.id)
-        .offset(skip).limit(limit)
-    )
-    items = result.scalars().all()
-    return items
+    stmt = select(ResearchItem).where(ResearchItem.user_id == current_user.id)
+    return await _list_items(db, response, stmt, view, skip, limit)
 
 @router.get("/categories")
 async def list_categories(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     cats = ['纵向项目','横向项目','学术论文','出版著作','专利','科技奖励']
@@ -110,55 +189,44 @@ async def list_categories(
         out.append({"category": c, "count": len(items)})
     return out
 
-@router.get("/category/{category}", response_model=List[ResearchItemResponse])
+@router.get("/category/{category}", response_model=List[Union[ResearchItemResponse, ResearchItemSummary]])
 async def read_research_items_by_category(
     category: str,
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    view: Tuple[Type[CamelModel], List[str]] = Depends(item_view),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
-    q = select(crud_research_item.research_item.model).join(ResearchSubtype, ResearchSubtype.id == crud_research_item.research_item.model.subtype_id)
-    if category == '纵向项目':
-        q = q.filter(ResearchSubtype.name.like('%纵向%'))
-    elif category == '横向项目':
-        q = q.filter(ResearchSubtype.name.like('%横向%'))
-    elif category == '学术论文':
-        q = q.filter(ResearchSubtype.name.like('%论文%'))
-    elif category == '出版著作':
-        q = q.filter(or_(ResearchSubtype.name.like('%出版%'), ResearchSubtype.name.like('%著作%')))
-    elif category == '专利':
-        q = q.filter(or_(ResearchSubtype.name.like('%专利%'), ResearchSubtype.name.like('%发明%')))
-    elif category == '科技奖励':
-        q = q.filter(or_(ResearchSubtype.name.like('%奖励%'), ResearchSubtype.name.like('%获奖%')))
-    q = q.filter(crud_research_item.research_item.model.user_id == current_user.id).offset(skip).limit(limit)
-    items = (await db.execute(q)).scalars().all()
-    return items
+    stmt = (
+        select(ResearchItem)
+        .join(ResearchSubtype, ResearchSubtype.id == ResearchItem.subtype_id)
+        .where(ResearchItem.user_id == current_user.id)
+    )
+    cond = _category_filter(category)
+    if cond is not None:
+        stmt = stmt.where(cond)
+    return await _list_items(db, response, stmt, view, skip, limit)
 
 
-@router.get("/all", response_model=List[ResearchItemResponse])
+@router.get("/all", response_model=List[Union[ResearchItemResponse, ResearchItemSummary]])
 async def read_all_research_items(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    view: Tuple[Type[CamelModel], List[str]] = Depends(item_view),
     current_user: User = Depends(deps.get_current_active_auditor),
 ) -> Any:
     """Retrieve all research items (admin/auditor only)."""
-    result = await db.execute(
-        select(crud_research_item.research_item.model)
-        .options(
-            selectinload(crud_research_item.research_item.model.subtype).selectinload(ResearchSubtype.type)
-        )
-        .offset(skip).limit(limit)
-    )
-    items = result.scalars().all()
-    return items
+    return await _list_items(db, response, select(ResearchItem), view, skip, limit)
 
 
 @router.put("/batch/status", status_code=status.HTTP_200_OK)
 async def batch_update_research_item_status(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     status_in: ResearchItemBatchStatusUpdate,
     current_user: User = Depends(deps.get_current_active_auditor),
     request: Request
@@ -173,24 +241,35 @@ async def batch_update_research_item_status(
     target_ids = [i for i in status_in.ids if i in pending_ids]
     if not target_ids:
         raise HTTPException(status_code=400, detail="No pending items to update")
+    stats_before = await research_stats.contributions(db, target_ids)
     updated_count = await crud_research_item.research_item.update_status_multi(
         db=db, ids=target_ids, status=status_in.status, remarks=status_in.remarks
     )
-    log_entry = AuditLogCreate(
-        user_id=current_user.id,
-        action=f'批量更新项目状态为 {status_in.status.value}',
-        target_type='research_item',
-        new_value=status_in.model_dump(),
-        ip=request.client.host
-    )
-    await crud_audit_log.audit_log.create(db, obj_in=log_entry)
+    await research_stats.apply(db, stats_before, await research_stats.contributions(db, target_ids))
+    await profile_summaries.refresh_research(db, await profile_summaries.users_for_items(db, target_ids))
+    old_state = {"status": ApprovalStatus.pending.value}
+    new_state = {"status": status_in.status.value, "audit_remarks": status_in.remarks}
+    old_value, new_value = item_history.diff(old_state, new_state)
+    log_entries = [
+        AuditLogCreate(
+            user_id=current_user.id,
+            action=f'批量更新项目状态为 {status_in.status.value}',
+            target_type=item_history.TARGET_TYPE,
+            target_id=item_id,
+            old_value=old_value,
+            new_value=new_value,
+            ip=request.client.host
+        )
+        for item_id in target_ids
+    ]
+    await audit_sink.record_many(db, log_entries, critical=True)
     return {"message": f"Successfully updated {updated_count} items"}
 
 
 @router.put("/{id}/status", response_model=ResearchItemResponse)
 async def update_research_item_status(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     id: int,
     status_in: ResearchItemStatusUpdate,
     current_user: User = Depends(deps.get_current_active_auditor),
@@ -202,91 +281,177 @@ async def update_research_item_status(
         raise HTTPException(status_code=404, detail="Research item not found")
     if item.status != ApprovalStatus.pending:
         raise HTTPException(status_code=400, detail="Item has already been reviewed")
-    old_status = item.status
-    updated_item = await crud_research_item.research_item.update(db=db, db_obj=item, obj_in=status_in)
-    
+    before = item_history.snapshot(item)
+    update_data = {"status": status_in.status, "audit_remarks": status_in.remarks}
+    if status_in.status == ApprovalStatus.approved:
+        update_data["approve_time"] = datetime.utcnow()
+    stats_before = await research_stats.contributions(db, [id])
+    updated_item = await crud_research_item.research_item.update(db=db, db_obj=item, obj_in=update_data)
+    await research_stats.apply(db, stats_before, await research_stats.contributions(db, [id]))
+    await profile_summaries.refresh_research(db, await profile_summaries.users_for_items(db, [id]))
+    old_value, new_value = item_history.diff(before, item_history.snapshot(updated_item))
     log_entry = AuditLogCreate(
         user_id=current_user.id,
         action='更新项目状态',
-        target_type='research_item',
+        target_type=item_history.TARGET_TYPE,
         target_id=id,
-        old_value={'status': old_status.value},
-        new_value=status_in.model_dump(),
+        old_value=old_value,
+        new_value=new_value,
         ip=request.client.host
     )
-    await crud_audit_log.audit_log.create(db, obj_in=log_entry)
-    return updated_item
+    await audit_sink.record(db, log_entry, critical=True)
+    return await crud_research_item.research_item.get_with_subtype(db, id)
 
 
-@router.get("/user/{user_id}", response_model=List[ResearchItemResponse])
+@router.get("/user/{user_id}", response_model=List[Union[UserResearchItem, UserResearchItemSummary]])
 async def read_research_items_for_user(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     user_id: int = None,
+    cursor: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    view: Tuple[Type[CamelModel], List[str]] = Depends(user_item_view),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
-    """Retrieve research items where the specified user is owner or collaborator."""
+    """
+    Retrieve research items where the specified user is owner or collaborator,
+    in id order, each marked with `relation`. Pass the X-Next-Cursor header
+    back as `cursor` to page without OFFSET.
+    """
     if user_id is None:
         user_id = current_user.id
-    result = await db.execute(
-        select(crud_research_item.research_item.model)
-        .options(
-            selectinload(crud_research_item.research_item.model.subtype).selectinload(ResearchSubtype.type)
-        )
-        .filter(
-            (crud_research_item.research_item.model.user_id == user_id) |
-            (crud_research_item.research_item.model.id.in_(
-                select(ResearchCollaborator.item_id).filter(ResearchCollaborator.user_id == user_id)
-            ))
-        )
-        .offset(skip).limit(limit)
+    if cursor is not None:
+        skip = 0
+    mine = crud_research_item.research_item.ids_for_user(user_id, after=cursor, limit=skip + limit)
+    stmt = select(ResearchItem).join(mine, mine.c.item_id == ResearchItem.id)
+    return await _list_items(
+        db, response, stmt, view, skip, limit, extra={"relation": mine.c.relation}, next_cursor=True
     )
-    items = result.scalars().all()
-    return items
 
 
+async def _load_subtypes(db: AsyncSession) -> List[dict]:
+    result = await db.execute(select(ResearchSubtype))
+    return [{"id": s.id, "name": s.name, "type_id": s.type_id} for s in result.scalars().all()]
+
 @router.get("/subtypes", response_model=List[ResearchSubtypeSchema])
 async def list_research_subtypes(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_token_user),
 ) -> Any:
     """List available research subtypes for binding correct DB IDs."""
-    result = await db.execute(select(ResearchSubtype))
-    subs = result.scalars().all()
-    return subs
+    version = await resource_versions.get(db, RESEARCH_SUBTYPES)
+    not_modified = resource_versions.conditional(request, response, RESEARCH_SUBTYPES, version)
+    if not_modified is not None:
+        return not_modified
+    return await cached_json(
+        request, response, RESEARCH_SUBTYPES, "all", lambda: _load_subtypes(db),
+        schema=List[ResearchSubtypeSchema], version=version,
+    )
 
 @router.get("/subtypes/mapping")
 async def list_research_subtype_category_mapping(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_token_user),
+) -> Any:
+    version = await resource_versions.get(db, RESEARCH_SUBTYPES)
+    not_modified = resource_versions.conditional(request, response, RESEARCH_SUBTYPES, version)
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        subs = await reference_cache.get_or_load(RESEARCH_SUBTYPES, "all", lambda: _load_subtypes(db), version=version)
+        return [{"id": s["id"], "name": s["name"], "category": subtype_category(s["name"])} for s in subs]
+
+    return await cached_json(request, response, RESEARCH_SUBTYPES, "mapping", load, version=version)
+
+
+@router.get("/{id}", response_model=ResearchItemResponse)
+async def read_research_item(
+    id: int,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
-    result = await db.execute(select(ResearchSubtype))
-    subs = result.scalars().all()
-    def map_cat(n: str) -> str:
-        if "纵向" in n:
-            return "纵向项目"
-        if "横向" in n:
-            return "横向项目"
-        if "论文" in n:
-            return "学术论文"
-        if "专利" in n or "发明" in n:
-            return "专利"
-        if "出版" in n or "著作" in n or "书" in n:
-            return "出版著作"
-        if "奖励" in n or "获奖" in n:
-            return "科技奖励"
-        return "其他"
-    return [{"id": s.id, "name": s.name, "category": map_cat(s.name or "")} for s in subs]
+    """Full research item including contentJson, for the detail view; lists return summaries."""
+    item = (await db.execute(
+        select(ResearchItem)
+        .options(selectinload(ResearchItem.subtype).selectinload(ResearchSubtype.type))
+        .where(ResearchItem.id == id)
+    )).scalars().first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Research item not found")
+    if item.user_id != current_user.id and not (current_user.is_superuser or current_user.role == "research_admin"):
+        is_collaborator = (await db.execute(
+            select(ResearchCollaborator.id).where(
+                ResearchCollaborator.item_id == id, ResearchCollaborator.user_id == current_user.id
+            ).limit(1)
+        )).first()
+        if not is_collaborator:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+    return item
+
+
+@router.get("/{id}/history")
+async def read_research_item_history(
+    id: int,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Change history of a research item, oldest first, one entry per recorded diff."""
+    item = await crud_research_item.research_item.get(db=db, id=id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Research item not found")
+    if item.user_id != current_user.id and not (current_user.is_superuser or current_user.role == "research_admin"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    entries = await item_history.list_history(db, id)
+    out = []
+    for e in entries:
+        is_snapshot = e.action in item_history.SNAPSHOT_ACTIONS
+        keys = [] if is_snapshot else sorted(set(e.old_value or {}) | set(e.new_value or {}))
+        out.append({
+            "id": e.id,
+            "action": e.action,
+            "userId": e.user_id,
+            "timestamp": e.created_at.isoformat() if e.created_at else None,
+            "snapshot": (e.new_value or {}) if is_snapshot else None,
+            "changes": {
+                k: {"old": (e.old_value or {}).get(k), "new": (e.new_value or {}).get(k)} for k in keys
+            },
+        })
+    return out
+
+
+@router.get("/{id}/history/state")
+async def read_research_item_state_at(
+    id: int,
+    at: datetime,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Rebuild a research item as it was at `at` by replaying diffs from the nearest snapshot."""
+    item = await crud_research_item.research_item.get(db=db, id=id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Research item not found")
+    if item.user_id != current_user.id and not (current_user.is_superuser or current_user.role == "research_admin"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    state = await item_history.state_at(db, id, at)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No history recorded before this time")
+    return {"id": id, "at": at.isoformat(), "state": state}
 
 
 @router.put("/{id}", response_model=ResearchItemResponse)
 async def update_research_item(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     id: int,
     item_in: ResearchItemUpdate,
     current_user: User = Depends(deps.get_current_active_user),
+    request: Request
 ) -> Any:
     """Update a research item."""
     item = await crud_research_item.research_item.get(db=db, id=id)
@@ -295,23 +460,53 @@ async def update_research_item(
     if item.user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
+    before = item_history.snapshot(item)
+    stats_before = await research_stats.contributions(db, [id])
     updated_item = await crud_research_item.research_item.update(db=db, db_obj=item, obj_in=item_in)
-    return updated_item
+    await research_stats.apply(db, stats_before, await research_stats.contributions(db, [id]))
+    await profile_summaries.refresh_research(db, await profile_summaries.users_for_items(db, [id]))
+    after = item_history.snapshot(updated_item)
+    old_value, new_value = item_history.diff(before, after)
+    if old_value or new_value:
+        log_entries = [AuditLogCreate(
+            user_id=current_user.id,
+            action='更新科研项目',
+            target_type=item_history.TARGET_TYPE,
+            target_id=id,
+            old_value=old_value,
+            new_value=new_value,
+            ip=request.client.host
+        )]
+        if await item_history.needs_snapshot(db, id):
+            log_entries.append(AuditLogCreate(
+                user_id=current_user.id,
+                action=item_history.SNAPSHOT_ACTION,
+                target_type=item_history.TARGET_TYPE,
+                target_id=id,
+                new_value=after,
+                ip=request.client.host
+            ))
+        await audit_sink.record_many(db, log_entries, critical=True)
+    return await crud_research_item.research_item.get_with_subtype(db, id)
 
 
 @router.delete("/{id}", response_model=ResearchItemResponse)
 async def delete_research_item(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     id: int,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Delete a research item."""
-    item = await crud_research_item.research_item.get(db=db, id=id)
+    item = await crud_research_item.research_item.get_with_subtype(db, id)
     if not item:
         raise HTTPException(status_code=404, detail="Research item not found")
     if item.user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
+    stats_before = await research_stats.contributions(db, [id])
+    affected_users = await profile_summaries.users_for_items(db, [id])
     deleted_item = await crud_research_item.research_item.remove(db=db, id=id)
+    await research_stats.apply(db, stats_before, {})
+    await profile_summaries.refresh_research(db, affected_users)
     return deleted_item
@@ -0,0 +1,83 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.api import deps
+from app.models.research_stat import ResearchStat
+from app.services import research_stats
+
+router = APIRouter()
+
+DIMENSIONS = {
+    "department": ResearchStat.department_code,
+    "category": ResearchStat.category,
+    "status": ResearchStat.status,
+    "year": ResearchStat.year,
+}
+
+
+async def _breakdown(db: AsyncSession, by: str, filters: dict) -> list:
+    dim = DIMENSIONS[by]
+    stmt = (
+        select(
+            dim,
+            func.sum(ResearchStat.item_count),
+            func.sum(ResearchStat.funding_total),
+            func.sum(ResearchStat.turnaround_count),
+            func.sum(ResearchStat.turnaround_seconds),
+        )
+        .group_by(dim)
+        .order_by(dim)
+    )
+    for name, value in filters.items():
+        if value is not None:
+            stmt = stmt.where(DIMENSIONS[name] == value)
+    out = []
+    for key, count, funding, approved, seconds in (await db.execute(stmt)).all():
+        if not count:
+            continue
+        out.append({
+            "key": key,
+            "count": int(count),
+            "funding": round(float(funding or 0), 2),
+            "avgTurnaroundDays": round(seconds / approved / 86400, 2) if approved else None,
+        })
+    return out
+
+
+@router.get("/summary")
+async def stats_summary(
+    year: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user = Depends(deps.require_permission("research.stats.view")),
+) -> Any:
+    """Counts, funding and approval turnaround by department, category, status and year."""
+    filters = {"year": year}
+    return {by: await _breakdown(db, by, filters if by != "year" else {}) for by in DIMENSIONS}
+
+
+@router.get("/breakdown")
+async def stats_breakdown(
+    by: str = Query(..., description="department | category | status | year"),
+    department: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    year: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user = Depends(deps.require_permission("research.stats.view")),
+) -> Any:
+    if by not in DIMENSIONS:
+        raise HTTPException(status_code=400, detail=f"by must be one of {', '.join(DIMENSIONS)}")
+    filters = {"department": department, "category": category, "status": status, "year": year}
+    return await _breakdown(db, by, filters)
+
+
+@router.post("/rebuild")
+async def rebuild_stats(
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Recompute the rollup from research_items, e.g. after first deploying it."""
+    keys = await research_stats.rebuild(db)
+    return {"status": "ok", "keys": keys}
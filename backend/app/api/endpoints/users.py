@@ -1,18 +1,27 @@
-from typing import Any, List
+import os
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 
 from app.crud import crud_user
 from app.models import User
-from app.schemas.user import UserCreate, UserUpdate, User as UserSchema
+from app.schemas.user import UserCreate, UserUpdate, UserListItem, User as UserSchema
 from sqlalchemy.future import select
-from app.models.department import Department, DepartmentAlias
+from app.services.departments import department_resolver
+from app.services import cv, profile_summaries, rbac, research_stats
+from app.models.rbac import UserRole
 from app.models.user_experience import UserExperience
+from app.models.user_profile_summary import UserProfileSummary
 from app.schemas.experience import ExperienceCreate, Experience as ExperienceSchema
+from app.schemas.profile import ProfileDocument
+from app.schemas.rbac import UserRolesUpdate
 from app.core.security import get_password_hash, verify_password
 from app.api import deps
+from app.api.fields import projected_response, sparse_fields
 
 router = APIRouter()
 
@@ -20,7 +29,7 @@ router = APIRouter()
 @router.post("/", response_model=UserSchema)
 async def create_user(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     user_in: UserCreate,
     # current_user: User = Depends(deps.get_current_active_superuser) # Optional: only superusers can create users
 ) -> Any:
@@ -32,6 +41,7 @@ async def create_user(
             detail="The user with this username already exists in the system.",
         )
     user = await crud_user.user.create(db, obj_in=user_in)
+    await rbac.sync_system_role(db, user.id, user.role)
     return user
 
 
@@ -43,7 +53,7 @@ async def read_user_me(current_user: User = Depends(deps.get_current_active_user
 @router.put("/me", response_model=UserSchema)
 async def update_user_me(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     user_in: UserUpdate,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -60,43 +70,172 @@ async def update_user_me(
             update_data["birth_date"] = date.fromisoformat(v)
     # Normalize department -> department_code if provided
     if "department" in update_data and "department_code" not in update_data:
-        name = update_data.get("department") or ""
-        def norm(s: str) -> str:
-            return (s or "").strip().lower().replace(" ", "")
-        res = await db.execute(select(Department))
-        rows = res.scalars().all()
-        code = None
-        for d in rows:
-            if norm(d.name) == norm(name):
-                code = d.code
-                break
-        if not code:
-            res2 = await db.execute(select(DepartmentAlias))
-            for a in res2.scalars().all():
-                if norm(a.alias) == norm(name):
-                    code = a.code
-                    break
+        code = await department_resolver.resolve(db, update_data.get("department"))
         if code:
             update_data["department_code"] = code
+    moved = "department_code" in update_data and update_data["department_code"] != user.department_code
+    stats_before = await research_stats.owned_contributions(db, [user.id]) if moved else {}
     user = await crud_user.user.update(db, db_obj=user, obj_in=update_data)
+    if moved:
+        await research_stats.apply(db, stats_before, await research_stats.owned_contributions(db, [user.id]))
+    await profile_summaries.refresh(db, user.id, sections=("user",), user=user)
     return user
 
-@router.get("/", response_model=List[UserSchema])
+@router.get("/", response_model=List[UserListItem])
 async def read_users(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
+    role: Optional[str] = None,
+    role_id: Optional[int] = Query(None, alias="roleId"),
+    department_code: Optional[str] = Query(None, alias="departmentCode"),
+    is_active: Optional[bool] = Query(None, alias="isActive"),
+    name_prefix: Optional[str] = Query(None, alias="namePrefix"),
+    cursor: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[List[str]] = Depends(sparse_fields(UserListItem)),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Retrieve users, in id order. role, departmentCode and isActive are each
+    the leading column of an (x, id) index; roleId walks user_roles by its
+    (role_id, user_id) index. namePrefix is a LIKE 'prefix%', which MySQL
+    serves as a range over ix_users_full_name with the matches sorted by id
+    afterwards (SQLite scans, as it does not use indexes for LIKE ... ESCAPE).
+    Pass the X-Next-Cursor header back as `cursor` to page without OFFSET,
+    and `fields` to select only some columns.
+    """
+    names = fields or list(UserListItem.model_fields)
+    stmt = select(*(getattr(User, f) for f in names))
+    if role_id is not None:
+        stmt = stmt.join(UserRole, (UserRole.user_id == User.id) & (UserRole.role_id == role_id))
+    if role:
+        stmt = stmt.where(User.role == role)
+    if department_code:
+        stmt = stmt.where(User.department_code == department_code)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+    if name_prefix:
+        escaped = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(User.full_name.like(escaped + "%", escape="\\"))
+    if cursor is not None:
+        stmt = stmt.where(User.id > cursor)
+        skip = 0
+    rows = (await db.execute(stmt.order_by(User.id).offset(skip).limit(limit))).mappings().all()
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return projected_response(rows, names, UserListItem, response)
+
+@router.get("/{user_id}/roles", response_model=List[int])
+async def read_user_roles(
+    user_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return await rbac.get_user_role_ids(db, user_id)
+
+@router.put("/{user_id}/roles", response_model=List[int])
+async def update_user_roles(
+    user_id: int,
+    body: UserRolesUpdate,
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Replace the user's role assignments; unknown role ids are ignored."""
+    user = await crud_user.user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await rbac.set_user_roles(db, user_id, body.role_ids)
+
+
+@router.get("/profiles", response_model=List[ProfileDocument])
+async def list_public_profiles(
+    db: AsyncSession = Depends(deps.get_db),
+    department_code: str = Query(None, alias="departmentCode"),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Faculty directory, served entirely from materialized profile summaries."""
+    q = select(UserProfileSummary.version, UserProfileSummary.document).where(UserProfileSummary.is_public.is_(True))
+    if department_code:
+        q = q.where(UserProfileSummary.department_code == department_code)
+    res = await db.execute(q.order_by(UserProfileSummary.user_id).offset(skip).limit(limit))
+    return [{"version": version, **document} for version, document in res.all()]
+
+@router.post("/profiles/rebuild")
+async def rebuild_profiles(
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user: User = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    """Retrieve users."""
-    users = await crud_user.user.get_multi(db, skip=skip, limit=limit)
-    return users
+    """Build or refresh every user's profile summary, e.g. to warm the directory."""
+    count = await profile_summaries.rebuild_all(db)
+    return {"status": "ok", "count": count}
 
+@router.get("/{user_id}/profile", response_model=ProfileDocument)
+async def read_user_profile(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Materialized profile document with ETag revalidation."""
+    summary = await profile_summaries.get(db, user_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    allowed = summary.is_public or current_user.id == user_id or current_user.is_superuser or current_user.role == "research_admin"
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Profile is not public")
+    etag = f'"{summary.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return {"version": summary.version, **summary.document}
+
+@router.get("/{user_id}/cv.docx")
+async def download_user_cv(
+    user_id: int,
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """CV rendered from the CV template, cached by the hash of its inputs."""
+    summary = await profile_summaries.get(db, user_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    allowed = summary.is_public or current_user.id == user_id or current_user.is_superuser or current_user.role == "research_admin"
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Profile is not public")
+    path, document = await cv.cv_for_user(db, user_id)
+    name = (document.get("user") or {}).get("full_name") or f"user_{user_id}"
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename=f"{name}_CV.docx",
+    )
+
+@router.get("/cv/department/{department_code}.zip")
+async def download_department_cvs(
+    department_code: str,
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
+    current_user: User = Depends(deps.get_current_active_auditor),
+) -> Any:
+    """Zip of every CV in a department, rendered through the worker pool."""
+    zip_path = await cv.department_zip(db, department_code)
+    if zip_path is None:
+        raise HTTPException(status_code=404, detail="No users in this department")
+    return FileResponse(
+        zip_path,
+        media_type="application/zip",
+        filename=f"{department_code}_CV.zip",
+        background=BackgroundTask(os.remove, zip_path),
+    )
 
 @router.put("/{user_id}", response_model=UserSchema)
 async def update_user(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     user_id: int,
     user_in: UserUpdate,
     current_user: User = Depends(deps.get_current_active_superuser),
@@ -116,38 +255,30 @@ async def update_user(
         elif isinstance(v, str):
             update_data["birth_date"] = date.fromisoformat(v)
     if "department" in update_data and "department_code" not in update_data:
-        name = update_data.get("department") or ""
-        def norm(s: str) -> str:
-            return (s or "").strip().lower().replace(" ", "")
-        # Try exact name
-        res = await db.execute(select(Department))
-        rows = res.scalars().all()
-        code = None
-        for d in rows:
-            if norm(d.name) == norm(name):
-                code = d.code
-                break
-        if not code:
-            res2 = await db.execute(select(DepartmentAlias))
-            for a in res2.scalars().all():
-                if norm(a.alias) == norm(name):
-                    code = a.code
-                    break
+        code = await department_resolver.resolve(db, update_data.get("department"))
         if code:
             update_data["department_code"] = code
+    moved = "department_code" in update_data and update_data["department_code"] != user.department_code
+    stats_before = await research_stats.owned_contributions(db, [user.id]) if moved else {}
     user = await crud_user.user.update(db, db_obj=user, obj_in=update_data)
+    if moved:
+        await research_stats.apply(db, stats_before, await research_stats.owned_contributions(db, [user.id]))
+    if update_data.get("role") is not None:
+        await rbac.sync_system_role(db, user.id, user.role)
+    await profile_summaries.refresh(db, user.id, sections=("user",), user=user)
     return user
 
 @router.delete("/{user_id}")
 async def delete_user(
     *, 
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     user_id: int,
     current_user: User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     user = await crud_user.user.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    await rbac.set_user_roles(db, user_id, [])
     await crud_user.user.remove(db, id=user_id)
     return {"status": "ok"}
 
@@ -162,7 +293,7 @@ async def list_my_experiences(
 @router.post("/me/experiences", response_model=ExperienceSchema)
 async def create_my_experience(
     body: ExperienceCreate,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     exp = UserExperience(
@@ -176,15 +307,16 @@ async def create_my_experience(
         order_index=body.order_index
     )
     db.add(exp)
-    await db.commit()
+    await db.flush()
     await db.refresh(exp)
+    await profile_summaries.refresh(db, current_user.id, sections=("experiences",), create=False)
     return exp
 
 @router.put("/me/experiences/{exp_id}", response_model=ExperienceSchema)
 async def update_my_experience(
     exp_id: int,
     body: ExperienceCreate,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     res = await db.execute(select(UserExperience).where(UserExperience.id == exp_id, UserExperience.user_id == current_user.id))
@@ -202,14 +334,15 @@ async def update_my_experience(
     exp.description = body.description
     exp.order_index = body.order_index
     db.add(exp)
-    await db.commit()
+    await db.flush()
     await db.refresh(exp)
+    await profile_summaries.refresh(db, current_user.id, sections=("experiences",), create=False)
     return exp
 
 @router.delete("/me/experiences/{exp_id}")
 async def delete_my_experience(
     exp_id: int,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     res = await db.execute(select(UserExperience).where(UserExperience.id == exp_id, UserExperience.user_id == current_user.id))
@@ -217,13 +350,14 @@ async def delete_my_experience(
     if not exp:
         raise HTTPException(status_code=404, detail="Experience not found")
     await db.delete(exp)
-    await db.commit()
+    await db.flush()
+    await profile_summaries.refresh(db, current_user.id, sections=("experiences",), create=False)
     return {"status": "ok"}
 
 @router.put("/me/password")
 async def change_my_password(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_uow, scope="function"),
     old_password: str = Body(...),
     new_password: str = Body(...),
     current_user: User = Depends(deps.get_current_active_user),
@@ -235,6 +369,5 @@ async def change_my_password(
         raise HTTPException(status_code=400, detail="旧密码不正确")
     user.hashed_password = get_password_hash(new_password)
     db.add(user)
-    await db.commit()
     return {"status": "ok"}
 
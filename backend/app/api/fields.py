@@ -0,0 +1,58 @@
+from typing import Callable, List, Mapping, Optional, Sequence, Type
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+
+from app.core.responses import ORJSONResponse
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,title,status"
+
+
+def parse_fields(raw: Optional[str], schema: Type[BaseModel], always: Sequence[str] = ("id",)) -> Optional[List[str]]:
+    """
+    Parse `a,b` (camelCase or snake_case names of `schema`) into field names,
+    `always` first. None when `raw` is empty, so callers fall back to every
+    field of the schema.
+    """
+    if not raw:
+        return None
+    by_name = {}
+    for name, info in schema.model_fields.items():
+        by_name[name] = name
+        by_name[info.alias or name] = name
+    names = list(always)
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name = by_name.get(part)
+        if name is None:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {part}")
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def sparse_fields(schema: Type[BaseModel], always: Sequence[str] = ("id",)) -> Callable:
+    """Dependency reading `?fields=` for a list of `schema` rows; see parse_fields."""
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    ) -> Optional[List[str]]:
+        return parse_fields(fields, schema, always)
+
+    return dependency
+
+
+def projected_response(
+    rows: Sequence[Mapping], names: Sequence[str], schema: Type[BaseModel], response: Response
+) -> ORJSONResponse:
+    """
+    Serialize projected rows under the schema's aliases without building model
+    instances. Headers set on the endpoint's `response` (e.g. X-Next-Cursor)
+    are carried over, since a returned Response replaces it.
+    """
+    keys = [(name, schema.model_fields[name].alias or name) for name in names]
+    out = ORJSONResponse([{alias: row[name] for name, alias in keys} for row in rows])
+    out.headers.raw.extend(response.headers.raw)
+    return out
@@ -8,6 +8,14 @@ class Settings(BaseSettings):
     DB_DIALECT: str = "sqlite"
     DB_PATH: str = "./database.sqlite"
     DB_LOGGING: bool = True
+    # 只读副本（完整的 SQLAlchemy 异步 URL 列表，为空则全部走主库）；
+    # 写入后 N 秒内同一客户端的读请求仍走主库（写响应带签名的 X-Primary-Until，客户端回传）；副本连接失败后 N 秒内不再尝试
+    DB_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STICKY_SECONDS: float = 5.0
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    # 启动时的数据库版本检查：check 版本不一致则拒绝启动；upgrade 加锁迁移到最新；off 跳过
+    # 没有 alembic_version 的旧库在 check/upgrade 下都会加锁接管：补齐旧启动钩子的表结构，标记为 517310327b3e 后迁移到最新
+    DB_MIGRATION_MODE: str = "check"
     
     # MySQL 特定配置
     DB_HOST: str = "127.0.0.1"
@@ -33,6 +41,38 @@ class Settings(BaseSettings):
     
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
 
+    # 通知已读回执写缓冲（秒），窗口内的连续点击合并为一条 UPDATE
+    NOTICE_READ_FLUSH_SECONDS: float = 0.5
+    # 院系名称/别名解析缓存的过期时间（秒），本进程写入时立即刷新
+    DEPARTMENT_CACHE_TTL_SECONDS: float = 300
+
+    # 审计日志写入模式：buffered 批量异步写入（关键操作仍同步），sync 全部同步写入
+    AUDIT_LOG_MODE: str = "buffered"
+    AUDIT_LOG_BATCH_SIZE: int = 100
+    AUDIT_LOG_FLUSH_SECONDS: float = 1.0
+    # 审计日志归档：保留最近 N 个月，更早的按月移入 audit_logs_YYYYMM 表或压缩 NDJSON 文件
+    AUDIT_RETENTION_MONTHS: int = 12
+    AUDIT_ARCHIVE_MODE: str = "table"  # table | ndjson
+    AUDIT_ARCHIVE_DIR: str = "./archive/audit_logs"
+    # 科研项目历史每记录 N 条差异写入一次完整快照
+    AUDIT_SNAPSHOT_INTERVAL: int = 20
+
+    # 简历生成：模板路径、按输入内容哈希缓存的目录、批量生成的进程数
+    CV_TEMPLATE_PATH: str = "../CV模版.docx"
+    CV_CACHE_DIR: str = "./cache/cv"
+    CV_WORKERS: int = 2
+
+    # 参考数据（院系、科研类型、角色权限等）读缓存：过期秒数与最大条目数
+    REFERENCE_CACHE_TTL_SECONDS: int = 600
+    REFERENCE_CACHE_MAX_ENTRIES: int = 1024
+
+    # 响应压缩：按优先顺序协商的编码（br 需安装 brotli）、最小压缩字节数、可压缩的内容类型（前缀匹配）
+    COMPRESSION_ENCODINGS: List[str] = ["br", "gzip"]
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: List[str] = ["application/json", "application/x-ndjson", "text/"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="",
@@ -1,12 +1,17 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Union
 
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def pwd_context():
+    # passlib is only needed at login and on password changes, not at import
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
 
 
 ALGORITHM = "HS256"
@@ -27,10 +32,10 @@ def create_access_token(
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     # bcrypt限制密码长度为72字节，超过部分会被忽略
     # 这里手动截断以避免警告
-    return pwd_context.hash(password[:72])
+    return pwd_context().hash(password[:72])
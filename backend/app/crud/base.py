@@ -1,7 +1,9 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Generic, List, Optional, Sequence, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import inspect as sa_inspect, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -16,6 +18,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
+        Writes only flush; the caller's unit of work (deps.get_uow) commits.
 
         **Parameters**
 
@@ -36,6 +39,41 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         )
         return result.scalars().all()
 
+    @cached_property
+    def column_keys(self) -> FrozenSet[str]:
+        # Resolved on first use: the mapper can only be configured once every model is imported
+        return frozenset(attr.key for attr in sa_inspect(self.model).column_attrs)
+
+    def _row(self, obj_in: Union[BaseModel, Dict[str, Any]], exclude_unset: bool = False) -> Dict[str, Any]:
+        """Column values of a schema or dict; keys that are not columns are dropped."""
+        data = obj_in.model_dump(exclude_unset=exclude_unset) if isinstance(obj_in, BaseModel) else obj_in
+        return {k: v for k, v in data.items() if k in self.column_keys}
+
+    def _insert(self, name: str):
+        """INSERT construct of the named dialect, which carries its ON CONFLICT / ON DUPLICATE KEY clause."""
+        if name == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+        elif name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(self.model)
+
+    @staticmethod
+    def _returning(db: AsyncSession) -> bool:
+        """Whether one executemany INSERT can return the rows it wrote (SQLite >= 3.35, PostgreSQL, not MySQL)."""
+        return bool(db.bind.dialect.insert_executemany_returning)
+
+    async def _load_generated(self, db: AsyncSession, db_obj: ModelType) -> None:
+        """
+        Load server-generated values (server defaults, onupdate) the flush left
+        expired, so they can be read without lazy IO. Dialects with RETURNING
+        already fetched them during the flush; this only selects on the rest.
+        """
+        expired = sa_inspect(db_obj).expired_attributes & self.column_keys
+        if expired:
+            await db.refresh(db_obj, attribute_names=list(expired))
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         if isinstance(obj_in, BaseModel):
             obj_in_data = obj_in.model_dump(by_alias=False)
@@ -43,31 +81,126 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
+        await self._load_generated(db, db_obj)
         return db_obj
 
     async def update(
-        self, db: AsyncSession, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        for field, value in self._row(obj_in, exclude_unset=True).items():
+            setattr(db_obj, field, value)
+        await db.flush()
+        await self._load_generated(db, db_obj)
         return db_obj
 
+    async def bulk_create(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """
+        Insert many rows and return them as loaded instances. Where the dialect
+        supports it this is one executemany INSERT ... RETURNING; otherwise the
+        objects are flushed together, which still costs a statement per row
+        because their primary keys are needed.
+        """
+        rows = [self._row(o) for o in objs_in]
+        if not rows:
+            return []
+        if self._returning(db):
+            objs = list((await db.scalars(insert(self.model).returning(self.model), rows)).all())
+        else:
+            objs = [self.model(**row) for row in rows]
+            db.add_all(objs)
+            await db.flush()
+        return objs
+
+    async def bulk_update(
+        self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]
+    ) -> int:
+        """
+        UPDATE rows by primary key in one executemany; each dict holds `id` and
+        the columns to change. Loaded instances are not refreshed.
+        """
+        rows = [self._row(r) for r in rows]
+        if not rows:
+            return 0
+        if any("id" not in r for r in rows):
+            raise ValueError("bulk_update rows need an id")
+        await db.execute(update(self.model), rows)
+        return len(rows)
+
+    def upsert_stmt(
+        self,
+        dialect: str,
+        *,
+        index_elements: Sequence[str],
+        update_fields: Sequence[str],
+        accumulate: bool = False,
+    ):
+        """
+        The INSERT ... ON CONFLICT (SQLite/PostgreSQL) or ON DUPLICATE KEY
+        UPDATE (MySQL) statement upsert_many executes on `dialect`. Colliding
+        rows get the incoming `update_fields`, or those added onto the stored
+        values with `accumulate`; with no `update_fields` they are left as is.
+        """
+        stmt = self._insert(dialect)
+        incoming = stmt.inserted if dialect == "mysql" else stmt.excluded
+        values = {
+            f: getattr(self.model, f) + incoming[f] if accumulate else incoming[f] for f in update_fields
+        }
+        if dialect == "mysql":
+            # No-op assignment of the key keeps colliding rows unchanged
+            return stmt.on_duplicate_key_update(values or {index_elements[0]: incoming[index_elements[0]]})
+        if values:
+            return stmt.on_conflict_do_update(index_elements=list(index_elements), set_=values)
+        return stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        rows: Sequence[Union[BaseModel, Dict[str, Any]]],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        accumulate: bool = False,
+    ) -> List[ModelType]:
+        """
+        Insert rows, updating `update_fields` (default: every other column
+        given) where a row collides on the unique key `index_elements`; with
+        `accumulate` the incoming values are added to the stored ones, and
+        with an empty `update_fields` collisions are left untouched. Compiles
+        to INSERT ... ON CONFLICT on SQLite/PostgreSQL and ON DUPLICATE KEY
+        UPDATE on MySQL (which matches any unique key, so `index_elements`
+        should be the only one the rows can hit). Returns the written rows
+        where the dialect supports RETURNING, otherwise an empty list.
+        """
+        rows = [self._row(r) for r in rows]
+        if not rows:
+            return []
+        if update_fields is None:
+            update_fields = [k for k in rows[0] if k not in index_elements and k != "id"]
+        stmt = self.upsert_stmt(
+            db.bind.dialect.name, index_elements=index_elements, update_fields=update_fields, accumulate=accumulate
+        )
+        objs: List[ModelType] = []
+        if self._returning(db):
+            result = await db.scalars(
+                stmt.returning(self.model), rows, execution_options={"populate_existing": True}
+            )
+            objs = list(result.all())
+        else:
+            await db.execute(stmt, rows)
+        return objs
+
     async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
         result = await db.execute(select(self.model).filter(self.model.id == id))
         obj = result.scalars().first()
         if obj:
             await db.delete(obj)
-            await db.commit()
+            await db.flush()
         return obj
 
@@ -1,9 +1,65 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
 from app.crud.base import CRUDBase
-from app.models.audit_log import AuditLog
+from app.models.audit_log import AuditArchiveCheckpoint, AuditLog
 from app.schemas.audit_log import AuditLogCreate, AuditLogUpdate
+from app.services.audit_chain import chain_hash
 
 class CRUDAuditLog(CRUDBase[AuditLog, AuditLogCreate, AuditLogUpdate]):
-    pass
+    def __init__(self, model):
+        super().__init__(model)
+        self._chain_lock = asyncio.Lock()
 
-audit_log = CRUDAuditLog(AuditLog)
+    @staticmethod
+    def to_row(obj_in: AuditLogCreate) -> Dict[str, Any]:
+        """Column values for an entry, stamped with the time it was recorded."""
+        row = obj_in.model_dump(by_alias=False)
+        # Whole seconds, so the hashed value matches what DATETIME columns store
+        row["created_at"] = datetime.utcnow().replace(microsecond=0)
+        return row
 
+    async def last_hash(self, db: AsyncSession, *, before_id: Optional[int] = None, lock: bool = False) -> Optional[str]:
+        """
+        chain_hash of the newest hashed row (optionally the newest below
+        `before_id`). When archiving has moved every such row out of
+        audit_logs, the hash recorded by the newest matching archive
+        checkpoint is returned instead.
+        """
+        stmt = select(AuditLog.chain_hash).where(AuditLog.chain_hash.is_not(None))
+        if before_id is not None:
+            stmt = stmt.where(AuditLog.id < before_id)
+        stmt = stmt.order_by(AuditLog.id.desc()).limit(1)
+        if lock:
+            stmt = stmt.with_for_update()
+        found = (await db.execute(stmt)).scalar()
+        if found is not None:
+            return found
+        stmt = select(AuditArchiveCheckpoint.last_hash)
+        if before_id is not None:
+            stmt = stmt.where(AuditArchiveCheckpoint.last_id < before_id)
+        stmt = stmt.order_by(AuditArchiveCheckpoint.last_id.desc()).limit(1)
+        return (await db.execute(stmt)).scalar()
+
+    async def create_multi(self, db: AsyncSession, *, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert prepared rows in one multi-row INSERT and commit, without reading
+        them back. Rows are chained onto the last hash; the tail row is locked
+        (and writers in this process serialized) until the commit.
+        """
+        if not rows:
+            return 0
+        async with self._chain_lock:
+            prev = await self.last_hash(db, lock=True)
+            for row in rows:
+                prev = row["chain_hash"] = chain_hash(prev, row)
+            await db.execute(insert(AuditLog), rows)
+            await db.commit()
+        return len(rows)
+
+audit_log = CRUDAuditLog(AuditLog)
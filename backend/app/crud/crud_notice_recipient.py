@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.notice_recipient import NoticeRecipient
+from app.schemas.notice import NoticeRecipientCreate
+
+
+class CRUDNoticeRecipient(CRUDBase[NoticeRecipient, NoticeRecipientCreate, NoticeRecipientCreate]):
+    async def mark_read_multi(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        notice_ids: Optional[Iterable[int]] = None,
+        before: Optional[datetime] = None,
+        read_at: Optional[datetime] = None,
+    ) -> int:
+        """Mark a user's unread receipts as read with a single UPDATE."""
+        stmt = (
+            update(NoticeRecipient)
+            .where(NoticeRecipient.user_id == user_id, NoticeRecipient.is_read.is_not(True))
+            .values(is_read=True, read_at=read_at or datetime.utcnow())
+        )
+        if notice_ids is not None:
+            stmt = stmt.where(NoticeRecipient.notice_id.in_(list(notice_ids)))
+        if before is not None:
+            stmt = stmt.where(NoticeRecipient.created_at <= before)
+        result = await db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+
+
+notice_recipient = CRUDNoticeRecipient(NoticeRecipient)
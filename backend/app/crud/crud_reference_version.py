@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+from app.crud.base import CRUDBase
+from app.models.reference_version import ReferenceVersion
+
+
+class CRUDReferenceVersion(CRUDBase[ReferenceVersion, BaseModel, BaseModel]):
+    pass
+
+reference_version = CRUDReferenceVersion(ReferenceVersion)
@@ -1,18 +1,30 @@
 from typing import List, Optional
 from datetime import datetime
 
-from sqlalchemy import update
+from sqlalchemy import func, literal, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 
 from app.crud.base import CRUDBase
 from app.models.research_item import ResearchItem, ApprovalStatus
+from app.models.research_type import ResearchSubtype
 from app.models.user import User
 from app.models.research_collaborator import ResearchCollaborator
 from app.schemas.research import ResearchItemCreate, ResearchItemUpdate
 
 
 class CRUDResearchItem(CRUDBase[ResearchItem, ResearchItemCreate, ResearchItemUpdate]):
+    async def get_with_subtype(self, db: AsyncSession, id: int) -> Optional[ResearchItem]:
+        """Get an item with subtype and type loaded, so `category` can be read outside the session."""
+        result = await db.execute(
+            select(ResearchItem)
+            .options(selectinload(ResearchItem.subtype).selectinload(ResearchSubtype.type))
+            .filter(ResearchItem.id == id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
     async def create_with_owner(
         self, db: AsyncSession, *, obj_in: ResearchItemCreate, owner_id: int
     ) -> ResearchItem:
@@ -38,8 +50,8 @@ class CRUDResearchItem(CRUDBase[ResearchItem, ResearchItemCreate, ResearchItemUp
                 collaborator = ResearchCollaborator(item_id=db_obj.id, user_id=user.id)
                 db.add(collaborator)
 
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
+        await self._load_generated(db, db_obj)
         return db_obj
 
     async def get_multi_by_owner(
@@ -54,19 +66,44 @@ class CRUDResearchItem(CRUDBase[ResearchItem, ResearchItemCreate, ResearchItemUp
         )
         return result.scalars().all()
 
+    def ids_for_user(self, user_id: int, *, after: Optional[int] = None, limit: int = 100):
+        """
+        Subquery of (item_id, relation) for the items a user owns ("owner") or
+        collaborates on ("collaborator"), as a UNION of two index range scans:
+        research_items (user_id, id) and research_collaborators (user_id,
+        item_id). Each branch stops after `limit` ids above `after`, so the
+        cost does not grow with the table. An owner who is also listed as a
+        collaborator is reported once, as owner.
+        """
+        owned = select(ResearchItem.id.label("item_id"), literal("owner").label("relation")).where(
+            ResearchItem.user_id == user_id
+        )
+        shared = select(
+            ResearchCollaborator.item_id.label("item_id"), literal("collaborator").label("relation")
+        ).where(ResearchCollaborator.user_id == user_id)
+        if after is not None:
+            owned = owned.where(ResearchItem.id > after)
+            shared = shared.where(ResearchCollaborator.item_id > after)
+        # LIMIT inside each branch needs a derived table on SQLite and MySQL
+        branches = [
+            select(*q.order_by(q.selected_columns.item_id).limit(limit).subquery().c) for q in (owned, shared)
+        ]
+        both = union_all(*branches).subquery()
+        return (
+            select(both.c.item_id, func.max(both.c.relation).label("relation"))  # "owner" > "collaborator"
+            .group_by(both.c.item_id)
+            .subquery("mine")
+        )
+
     async def get_multi_for_user(
-        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, user_id: int, after: Optional[int] = None, limit: int = 100
     ) -> List[ResearchItem]:
-        """Retrieve research items where the user is owner or collaborator."""
+        """Research items where the user is owner or collaborator, in id order after `after`."""
+        mine = self.ids_for_user(user_id, after=after, limit=limit)
         result = await db.execute(
             select(self.model)
-            .filter(
-                (ResearchItem.user_id == user_id) |
-                (ResearchItem.id.in_(
-                    select(ResearchCollaborator.item_id).filter(ResearchCollaborator.user_id == user_id)
-                ))
-            )
-            .offset(skip)
+            .join(mine, mine.c.item_id == ResearchItem.id)
+            .order_by(ResearchItem.id)
             .limit(limit)
         )
         return result.scalars().all()
@@ -99,7 +136,6 @@ class CRUDResearchItem(CRUDBase[ResearchItem, ResearchItemCreate, ResearchItemUp
             .where(ResearchItem.id.in_(ids))
             .values(**values_to_update)
         )
-        await db.commit()
         return result.rowcount
 
 research_item = CRUDResearchItem(ResearchItem)
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+from app.crud.base import CRUDBase
+from app.models.research_stat import ResearchStat
+
+
+class CRUDResearchStat(CRUDBase[ResearchStat, BaseModel, BaseModel]):
+    pass
+
+research_stat = CRUDResearchStat(ResearchStat)
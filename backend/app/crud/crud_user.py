@@ -23,12 +23,16 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             role=(obj_in.role or ("sys_admin" if obj_in.is_superuser else "teacher")),
         )
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
+        await self._load_generated(db, db_obj)
         return db_obj
 
     async def update(
-        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]],
     ) -> User:
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -0,0 +1,155 @@
+import ast
+import glob
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+LOCK_NAME = "research_info_schema_upgrade"
+# Revision the pre-Alembic schema corresponds to
+BASELINE_REVISION = "517310327b3e"
+
+
+def alembic_config():
+    from alembic.config import Config
+    cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return cfg
+
+
+def _revision_ids(path: str) -> Dict[str, Optional[str]]:
+    ids = {}
+    for node in ast.parse(open(path, encoding="utf-8").read()).body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            if node.target.id in ("revision", "down_revision"):
+                ids[node.target.id] = ast.literal_eval(node.value)
+    return ids
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """
+    Head of the revision files on disk, read from their `revision` /
+    `down_revision` assignments so the boot check does not import Alembic.
+    Falls back to Alembic's ScriptDirectory if the files are not a single
+    linear chain.
+    """
+    revisions, parents = set(), set()
+    for path in glob.glob(os.path.join(BACKEND_DIR, "alembic", "versions", "*.py")):
+        ids = _revision_ids(path)
+        down = ids.get("down_revision")
+        if not isinstance(ids.get("revision"), str) or not (down is None or isinstance(down, str)):
+            break
+        revisions.add(ids["revision"])
+        if down:
+            parents.add(down)
+    else:
+        heads = revisions - parents
+        if len(heads) == 1:
+            return heads.pop()
+    from alembic.script import ScriptDirectory
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def current_revision(conn: AsyncConnection) -> Optional[str]:
+    """The database's alembic_version, or None when it was never stamped."""
+    try:
+        return (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except DBAPIError:
+        await conn.rollback()
+        return None
+
+
+def _run(sync_conn, fn, *args) -> None:
+    cfg = alembic_config()
+    cfg.attributes["connection"] = sync_conn
+    fn(cfg, *args)
+
+
+def upgrade_head(sync_conn) -> None:
+    from alembic import command
+    _run(sync_conn, command.upgrade, "head")
+
+
+def stamp_head(sync_conn) -> None:
+    """Mark a schema built by metadata.create_all as current."""
+    from alembic import command
+    _run(sync_conn, command.stamp, "head")
+
+
+def _has_tables(sync_conn) -> bool:
+    from sqlalchemy import inspect
+    return inspect(sync_conn).has_table("users")
+
+
+def adopt_unversioned(sync_conn) -> None:
+    """
+    Bring a schema that predates Alembic (no alembic_version row) under
+    version control without replaying the initial migration, which drops
+    tables such databases still use: stamp the baseline and upgrade to head.
+    The first revision after it (b5e3f90a7c12) checks the live schema
+    before each step, so it completes whatever the old startup hook did.
+    """
+    from alembic import command
+    _run(sync_conn, command.stamp, BASELINE_REVISION)
+    upgrade_head(sync_conn)
+
+
+@asynccontextmanager
+async def _upgrade_lock(conn: AsyncConnection, timeout: int = 300):
+    """
+    Serialize concurrent upgrades from several workers. MySQL uses a named
+    lock held by this connection; SQLite is single-writer already.
+    """
+    if conn.dialect.name != "mysql":
+        yield
+        return
+    got = (await conn.execute(text("SELECT GET_LOCK(:n, :t)"), {"n": LOCK_NAME, "t": timeout})).scalar()
+    if got != 1:
+        raise RuntimeError(f"Timed out waiting for schema upgrade lock {LOCK_NAME}")
+    try:
+        yield
+    finally:
+        await conn.execute(text("SELECT RELEASE_LOCK(:n)"), {"n": LOCK_NAME})
+
+
+async def ensure_schema(engine: AsyncEngine, mode: str) -> None:
+    """
+    Compare alembic_version with the head revision: one SELECT when they
+    match. Otherwise refuse to start (mode "check") or upgrade under a lock
+    (mode "upgrade"), re-reading the version once the lock is held.
+
+    A database with tables but no version row predates Alembic; in either
+    mode it is adopted under the same lock (see adopt_unversioned) rather
+    than refused or migrated from the initial revision. An empty database
+    is left to init_db.py, which creates the tables and stamps head.
+    """
+    if mode == "off":
+        return
+    head = head_revision()
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+        if current == head:
+            return
+        # End the read snapshot so the re-check below sees other workers' upgrades
+        await conn.rollback()
+        if current is None and not await conn.run_sync(_has_tables):
+            raise RuntimeError("Database has no tables. Run `python init_db.py` to create the schema.")
+        if current is not None and mode != "upgrade":
+            raise RuntimeError(
+                f"Database schema is at {current}, code expects {head}. "
+                "Run `alembic upgrade head` or start with DB_MIGRATION_MODE=upgrade."
+            )
+        async with _upgrade_lock(conn):
+            current = await current_revision(conn)
+            if current is None:
+                await conn.run_sync(adopt_unversioned)
+                await conn.commit()
+            elif current != head:
+                await conn.run_sync(upgrade_head)
+                await conn.commit()
@@ -0,0 +1,90 @@
+"""
+Rows every database needs: departments and their aliases, the system roles
+and their grants, the permission catalog and the research (sub)types.
+
+Inserted by the revisions that introduced them (b5e3f90a7c12, c3f8e0a2b6d4)
+and by init_db.py, which builds fresh databases with create_all and stamps
+them at head without running those revisions. Both take a sync connection
+and only add what is missing, so they are safe to run again.
+"""
+from typing import Dict, List, Sequence
+
+import sqlalchemy as sa
+
+DEPARTMENTS = [{'code': 'CS', 'name': '计算机学院'}]
+DEPARTMENT_ALIASES = [
+    {'alias': '计算机科学与技术学院', 'code': 'CS'},
+    {'alias': '计院', 'code': 'CS'},
+    {'alias': '计算机', 'code': 'CS'},
+]
+# users.role string -> name of the seeded system role it corresponds to. System
+# roles are found by is_system plus this name, never by id: the ids are only
+# the seed's when no custom role was created before the seed ran.
+SYSTEM_ROLE_NAMES = {'sys_admin': '系统管理员', 'research_admin': '科研管理员', 'teacher': '教师'}
+ROLES = [
+    {'name': '系统管理员', 'description': '系统管理权限', 'is_system': True},
+    {'name': '科研管理员', 'description': '科研管理权限', 'is_system': True},
+    {'name': '教师', 'description': '教师默认权限', 'is_system': True},
+]
+# System role name -> permission codes it is granted
+SYSTEM_ROLE_GRANTS = {'科研管理员': ['research.stats.view']}
+PERMISSIONS = [
+    {'code': 'system.health.view', 'name': '查看系统健康', 'module': 'System'},
+    {'code': 'system.backup.run', 'name': '执行备份', 'module': 'System'},
+    {'code': 'system.cache.clear', 'name': '清理缓存', 'module': 'System'},
+    {'code': 'system.users.manage', 'name': '用户管理', 'module': 'System'},
+    {'code': 'system.rbac.manage', 'name': '角色与权限管理', 'module': 'System'},
+    {'code': 'master.departments.manage', 'name': '学院字典管理', 'module': 'System'},
+    {'code': 'research.audit', 'name': '科研审核', 'module': 'Research'},
+    {'code': 'research.notice.publish', 'name': '发布通知', 'module': 'Research'},
+    {'code': 'research.stats.view', 'name': '查看科研统计', 'module': 'Research'},
+    {'code': 'research.data.export', 'name': '数据导出', 'module': 'Research'},
+]
+RESEARCH_TYPES = [
+    {'id': 1, 'name': '项目', 'description': '科研项目'},
+    {'id': 2, 'name': '成果', 'description': '论文专著等成果'},
+]
+RESEARCH_SUBTYPES = [
+    {'id': 1, 'name': '纵向科研项目', 'type_id': 1},
+    {'id': 2, 'name': '横向科研项目', 'type_id': 1},
+    {'id': 3, 'name': '学术论文', 'type_id': 2},
+    {'id': 4, 'name': '出版著作', 'type_id': 2},
+    {'id': 5, 'name': '发明专利', 'type_id': 2},
+    {'id': 6, 'name': '科技奖励', 'type_id': 2},
+]
+
+
+def _insert_missing(conn, table: str, rows: List[Dict], keys: Sequence[str]) -> None:
+    """Insert the rows none of whose `keys` values are already present (as INSERT IGNORE did)."""
+    tbl = sa.table(table, *(sa.column(c) for c in rows[0]))
+    taken = {k: {r[0] for r in conn.execute(sa.select(tbl.c[k]))} for k in keys}
+    missing = [r for r in rows if not any(r[k] in taken[k] for k in keys)]
+    if missing:
+        conn.execute(sa.insert(tbl), missing)
+
+
+def seed_reference_rows(conn) -> None:
+    """Departments, aliases, system roles, permission catalog and research (sub)types."""
+    _insert_missing(conn, 'departments', DEPARTMENTS, ('code', 'name'))
+    _insert_missing(conn, 'department_aliases', DEPARTMENT_ALIASES, ('alias',))
+    _insert_missing(conn, 'roles', ROLES, ('name',))
+    _insert_missing(conn, 'permissions_catalog', PERMISSIONS, ('code',))
+    _insert_missing(conn, 'research_types', RESEARCH_TYPES, ('id', 'name'))
+    _insert_missing(conn, 'research_subtypes', RESEARCH_SUBTYPES, ('id',))
+
+
+def grant_system_permissions(conn) -> None:
+    """Give each system role in SYSTEM_ROLE_GRANTS the codes it lacks."""
+    for name, codes in SYSTEM_ROLE_GRANTS.items():
+        for code in codes:
+            conn.execute(sa.text(
+                "INSERT INTO role_permissions (role_id, code) "
+                "SELECT r.id, :code FROM roles r WHERE r.is_system = :system AND r.name = :name "
+                "AND NOT EXISTS (SELECT 1 FROM role_permissions p WHERE p.role_id = r.id AND p.code = :code)"
+            ), {"code": code, "name": name, "system": True})
+
+
+def seed(conn) -> None:
+    """Everything above, for a database built outside the revisions (init_db.py)."""
+    seed_reference_rows(conn)
+    grant_system_permissions(conn)
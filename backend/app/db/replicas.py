@@ -0,0 +1,110 @@
+import hashlib
+import hmac
+import itertools
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+STICKY_HEADER = "X-Primary-Until"
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine for read-only requests: replicas in round-robin order,
+    skipping any that failed to connect within the last `retry_seconds`, and
+    the primary (None) for clients that wrote within `sticky_seconds` so they
+    read their own writes despite replication lag.
+
+    Recent writers are not tracked here. A successful write is answered with
+    a signed X-Primary-Until token (an expiry time and its HMAC); the client
+    sends it back on later requests, so every worker routes it the same way.
+    Expiry uses wall-clock time, so workers need roughly synchronised clocks.
+    """
+
+    def __init__(self, sticky_seconds: float, retry_seconds: float, secret: str):
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._secret = secret.encode()
+        self.engines: List[AsyncEngine] = []
+        self._cycle = itertools.cycle(())
+        self._down_until: Dict[int, float] = {}
+
+    def init(self, urls: List[str]) -> None:
+        if not self.engines:
+            self.engines = [create_async_engine(url, pool_pre_ping=True) for url in urls]
+            self._cycle = itertools.cycle(range(len(self.engines)))
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+        self.engines = []
+        self._cycle = itertools.cycle(())
+        self._down_until.clear()
+
+    def _sign(self, until: int) -> str:
+        return hmac.new(self._secret, str(until).encode(), hashlib.sha256).hexdigest()[:32]
+
+    def write_token(self, now: Optional[float] = None) -> str:
+        """X-Primary-Until value for a client that has just written."""
+        until = int((time.time() if now is None else now) + self.sticky_seconds) + 1
+        return f"{until}.{self._sign(until)}"
+
+    def reads_primary(self, token: Optional[str]) -> bool:
+        """Whether an echoed X-Primary-Until token is genuine and unexpired."""
+        if not token:
+            return False
+        until, _, signature = token.partition(".")
+        if not until.isdigit() or not hmac.compare_digest(signature, self._sign(int(until))):
+            return False
+        return int(until) > time.time()
+
+    def pick(self, primary: bool = False) -> Optional[AsyncEngine]:
+        """A healthy replica, or None for the primary (always, when `primary` is set)."""
+        if not self.engines or primary:
+            return None
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            i = next(self._cycle)
+            if self._down_until.get(i, 0) <= now:
+                return self.engines[i]
+        return None
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        self._down_until[self.engines.index(engine)] = time.monotonic() + self.retry_seconds
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {"url": e.url.render_as_string(hide_password=True), "healthy": self._down_until.get(i, 0) <= now}
+            for i, e in enumerate(self.engines)
+        ]
+
+
+class PrimaryStickiness:
+    """ASGI middleware adding X-Primary-Until to successful write responses, so the client's next reads go to the primary."""
+
+    def __init__(self, app, *, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not self.router.engines:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                token = self.router.write_token().encode("latin-1")
+                message["headers"] = [*message.get("headers", []), (STICKY_HEADER.lower().encode("latin-1"), token)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+replica_router = ReplicaRouter(
+    settings.DB_REPLICA_STICKY_SECONDS, settings.DB_REPLICA_RETRY_SECONDS, settings.SECRET_KEY
+)
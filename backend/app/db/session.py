@@ -1,14 +1,53 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
+from app.db.replicas import replica_router
 
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# Created by init_engine() from the app lifespan (or a script) rather than at
+# import, so importing the app stays cheap; sessions bind on configure().
+engine: Optional[AsyncEngine] = None
 
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     autocommit=False, 
     autoflush=False, 
-    bind=engine, 
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+
+def init_engine() -> AsyncEngine:
+    global engine
+    if engine is None:
+        engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+        AsyncSessionLocal.configure(bind=engine)
+        replica_router.init(settings.DB_REPLICA_URLS)
+    return engine
+
+
+async def dispose_engine() -> None:
+    global engine
+    await replica_router.dispose()
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+
+
+async def read_session(primary: bool = False) -> AsyncSession:
+    """
+    Session for read-only work: a healthy replica unless `primary` is set
+    (the client wrote recently), otherwise the primary. A replica that fails to connect is
+    skipped for DB_REPLICA_RETRY_SECONDS and the primary is used instead;
+    errors after the connection is established are not retried.
+    """
+    replica = replica_router.pick(primary)
+    if replica is not None:
+        session = AsyncSessionLocal(bind=replica)
+        try:
+            await session.connection()
+            return session
+        except (DBAPIError, OSError):
+            await session.close()
+            replica_router.mark_down(replica)
+    return AsyncSessionLocal()
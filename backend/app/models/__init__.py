@@ -4,13 +4,16 @@ try:
     from .research_item import ResearchItem
     from .research_type import ResearchType
     from .research_collaborator import ResearchCollaborator
-    from .audit_log import AuditLog
+    from .audit_log import AuditLog, AuditArchiveCheckpoint
     from .notice import Notice
     from .notice_recipient import NoticeRecipient
     from .department import Department, DepartmentAlias
-    from .rbac import Role, RolePermission
+    from .rbac import Role, RolePermission, UserRole
     from .permission_catalog import PermissionCatalog
     from .user_experience import UserExperience
+    from .research_stat import ResearchStat
+    from .user_profile_summary import UserProfileSummary
+    from .reference_version import ReferenceVersion
 
 except ImportError as e:
     print(f"Error importing models: {e}")
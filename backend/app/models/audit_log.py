@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_user_created", "user_id", "created_at"),
+        Index("ix_audit_logs_action_created", "action", "created_at"),
+        Index("ix_audit_logs_target", "target_type", "target_id", "created_at"),
+        Index("ix_audit_logs_ip_created", "ip", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -13,5 +19,19 @@ class AuditLog(Base):
     old_value = Column(JSON)
     new_value = Column(JSON)
     ip = Column(String(100))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # sha256 of the previous row's chain_hash plus this row, see services/audit_chain.py
+    chain_hash = Column(String(64), nullable=True)
+
+
+class AuditArchiveCheckpoint(Base):
+    """Last hashed row of each archived month, so the chain can be followed past rows no longer in audit_logs."""
+    __tablename__ = "audit_archive_checkpoints"
 
+    id = Column(Integer, primary_key=True, index=True)
+    month = Column(String(6), nullable=False)  # YYYYMM
+    mode = Column(String(20), nullable=False)  # table | ndjson
+    rows = Column(Integer, nullable=False)
+    last_id = Column(Integer, nullable=False, index=True)
+    last_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
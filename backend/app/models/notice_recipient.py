@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class NoticeRecipient(Base):
     __tablename__ = "notice_recipients"
+    __table_args__ = (
+        Index("ix_notice_recipients_user_notice", "user_id", "notice_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     notice_id = Column(Integer, ForeignKey("notices.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -18,3 +18,14 @@ class RolePermission(Base):
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     code = Column(String(100), nullable=False)
     role = relationship("Role", back_populates="permissions")
+
+class UserRole(Base):
+    __tablename__ = "user_roles"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # The primary key serves user -> roles; this serves role -> users
+    __table_args__ = (
+        Index("ix_user_roles_role_user", "role_id", "user_id"),
+    )
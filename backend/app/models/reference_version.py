@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from app.db.base import Base
+
+class ReferenceVersion(Base):
+    """Version of a reference data namespace, bumped in the transaction that changes it; shared by all workers."""
+    __tablename__ = "reference_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
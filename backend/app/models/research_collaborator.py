@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class ResearchCollaborator(Base):
     __tablename__ = "research_collaborators"
+    # "Items I collaborate on" and "who works on these items", both index-only
+    __table_args__ = (
+        Index("ix_research_collaborators_user_item", "user_id", "item_id"),
+        Index("ix_research_collaborators_item_user", "item_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     item_id = Column(Integer, ForeignKey("research_items.id"), nullable=False)
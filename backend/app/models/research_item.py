@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, JSON, DateTime, Text
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, JSON, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 import enum
+from typing import Optional
 
 class ApprovalStatus(str, enum.Enum):
     draft = "draft"
@@ -12,6 +13,14 @@ class ApprovalStatus(str, enum.Enum):
 
 class ResearchItem(Base):
     __tablename__ = "research_items"
+    # List endpoints filter on owner or status and page in id order
+    __table_args__ = (
+        Index("ix_research_items_user_id_id", "user_id", "id"),
+        Index("ix_research_items_status_id", "status", "id"),
+        Index("ix_research_items_subtype_id", "subtype_id"),
+    )
+    # Fetch updated_at with the UPDATE itself (RETURNING) instead of a refresh afterwards
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -35,22 +44,27 @@ class ResearchItem(Base):
 
     @property
     def category(self) -> str:
-        n = (self.subtype.name if self.subtype else "") or ""
-        m = n.lower()
-        if "纵向" in n:
-            return "纵向项目"
-        if "横向" in n:
-            return "横向项目"
-        if "论文" in n:
-            return "学术论文"
-        if "专利" in n or "发明" in n:
-            return "专利"
-        if "出版" in n or "著作" in n or "书" in n:
-            return "出版著作"
-        if "奖励" in n or "获奖" in n:
-            return "科技奖励"
-        t = (self.subtype.type.name if self.subtype and self.subtype.type else "") or ""
-        if "项目" in t:
-            return "纵向项目"
-        return "其他"
+        return subtype_category(
+            self.subtype.name if self.subtype else None,
+            self.subtype.type.name if self.subtype and self.subtype.type else None,
+        )
 
+
+def subtype_category(subtype_name: Optional[str], type_name: Optional[str] = None) -> str:
+    """Map a subtype (and, as a fallback, its type) name to a display category."""
+    n = subtype_name or ""
+    if "纵向" in n:
+        return "纵向项目"
+    if "横向" in n:
+        return "横向项目"
+    if "论文" in n:
+        return "学术论文"
+    if "专利" in n or "发明" in n:
+        return "专利"
+    if "出版" in n or "著作" in n or "书" in n:
+        return "出版著作"
+    if "奖励" in n or "获奖" in n:
+        return "科技奖励"
+    if type_name and "项目" in type_name:
+        return "纵向项目"
+    return "其他"
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, BigInteger, UniqueConstraint
+from app.db.base import Base
+
+class ResearchStat(Base):
+    """Rollup of research items per (department, category, status, year), kept up to date on every item write."""
+    __tablename__ = "research_stats"
+    __table_args__ = (
+        UniqueConstraint("department_code", "category", "status", "year", name="uq_research_stats_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    department_code = Column(String(50), nullable=False, default="")  # "" = 未设置学院
+    category = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False)
+    year = Column(Integer, nullable=False)
+    item_count = Column(Integer, nullable=False, default=0)
+    funding_total = Column(Float, nullable=False, default=0)  # 万元, content_json.funding
+    turnaround_count = Column(Integer, nullable=False, default=0)
+    turnaround_seconds = Column(BigInteger, nullable=False, default=0)  # sum of approve_time - created_at
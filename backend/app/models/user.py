@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from sqlalchemy import Date
@@ -29,3 +29,10 @@ class User(Base):
     profile_public = Column(Boolean, default=False)
 
     research_items = relationship("ResearchItem", back_populates="owner", cascade="all, delete-orphan")
+
+    # Listing filters; each ends in id so keyset pages come straight off the index
+    __table_args__ = (
+        Index("ix_users_role_id", "role", "id"),
+        Index("ix_users_department_code_id", "department_code", "id"),
+        Index("ix_users_is_active_id", "is_active", "id"),
+    )
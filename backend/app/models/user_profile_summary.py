@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Boolean, JSON, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class UserProfileSummary(Base):
+    """Materialized profile document per user, rebuilt section by section when its sources change."""
+    __tablename__ = "user_profile_summaries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    etag = Column(String(64), nullable=False)
+    is_public = Column(Boolean, nullable=False, default=False, index=True)
+    department_code = Column(String(50), nullable=True, index=True)
+    document = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
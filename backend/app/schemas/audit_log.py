@@ -1,5 +1,6 @@
-from typing import Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any
 from datetime import datetime
+from pydantic import Field
 from .base import CamelModel
 
 class AuditLogBase(CamelModel):
@@ -22,3 +23,8 @@ class AuditLog(AuditLogBase):
 class AuditLogUpdate(AuditLogBase):
     pass
 
+# 未给出的字段取 AUDIT_RETENTION_MONTHS / AUDIT_ARCHIVE_MODE
+class AuditArchiveRequest(CamelModel):
+    older_than_months: Optional[int] = Field(None, ge=1)
+    mode: Optional[Literal["table", "ndjson"]] = None
+    dry_run: bool = False
@@ -0,0 +1,13 @@
+from typing import List, Optional
+from pydantic import Field
+from .base import CamelModel
+
+class DepartmentSuggestBatch(CamelModel):
+    names: List[Optional[str]]
+    # 低于该分数视为无匹配；“计算机学院”与“计算机科学与技术学院”约 0.46
+    min_score: float = Field(0.4, ge=0.0, le=1.0)
+
+class DepartmentBackfillStart(CamelModel):
+    dry_run: bool = Field(True, alias="dryRun")
+    chunk_size: int = Field(500, ge=1, le=10000)
+    overwrite: bool = False
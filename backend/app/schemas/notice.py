@@ -13,3 +13,11 @@ class NoticeCreate(CamelModel):
 class Notice(NoticeCreate):
     id: int
     created_at: datetime
+
+class NoticeRecipientCreate(CamelModel):
+    notice_id: int
+    user_id: int
+
+class NoticeReadBatch(CamelModel):
+    ids: Optional[List[int]] = None
+    all_before: Optional[datetime] = None  # 标记该时间之前收到的全部通知为已读
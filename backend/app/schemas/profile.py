@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Optional
+from .base import CamelModel
+
+# Public profile document, as materialized in user_profile_summaries
+class ProfileUser(CamelModel):
+    id: int
+    full_name: Optional[str] = None
+    department: Optional[str] = None
+    department_code: Optional[str] = None
+    gender: Optional[str] = None
+    office_location: Optional[str] = None
+    highest_education: Optional[str] = None
+    degree: Optional[str] = None
+    alma_mater: Optional[str] = None
+    major: Optional[str] = None
+    research_direction: Optional[str] = None
+    advisor_qualification: Optional[str] = None
+    profile_public: Optional[bool] = None
+
+class ProfileExperience(CamelModel):
+    type: str  # education | work
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    title: Optional[str] = None
+    institution: Optional[str] = None
+    description: Optional[str] = None
+
+class ProfileResearchItem(CamelModel):
+    id: int
+    title: str
+    category: Optional[str] = None
+    role: str  # owner | collaborator
+    approve_time: Optional[str] = None
+    content: Dict[str, Any] = {}
+
+class ProfileDocument(CamelModel):
+    version: int
+    user: ProfileUser
+    experiences: List[ProfileExperience] = []
+    research: List[ProfileResearchItem] = []
@@ -1,5 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
+from pydantic import Field
 from .base import CamelModel
 
 class RoleCreate(CamelModel):
@@ -21,3 +22,6 @@ class RoleResponse(CamelModel):
 
 class RolePermissionsUpdate(CamelModel):
     codes: List[str]
+
+class UserRolesUpdate(CamelModel):
+    role_ids: List[int] = Field(default_factory=list, alias="roleIds")
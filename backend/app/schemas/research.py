@@ -1,5 +1,5 @@
 from pydantic import Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 from enum import Enum
 from .base import CamelModel
@@ -39,3 +39,24 @@ class ResearchItemResponse(ResearchItemBase):
     updated_at: Optional[datetime] = None
     category: Optional[str] = None
 
+
+# Row of the research list views: no content_json, owner and category resolved by join
+class ResearchItemSummary(CamelModel):
+    id: int
+    title: str
+    category: Optional[str] = None
+    status: Optional[ApprovalStatus] = None
+    user_id: int
+    owner_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    approve_time: Optional[datetime] = None
+
+
+# Rows of a user's research list, marked by how the user is attached to the item
+class UserResearchItem(ResearchItemResponse):
+    relation: Literal["owner", "collaborator"]
+
+
+class UserResearchItemSummary(ResearchItemSummary):
+    relation: Literal["owner", "collaborator"]
@@ -41,6 +41,18 @@ class UserInDBBase(UserBase):
 class User(UserInDBBase):
     pass
 
+# Row of the admin user listing: identity and filter columns only
+class UserListItem(CamelModel):
+    id: int
+    email: str
+    full_name: Optional[str] = None
+    role: Optional[str] = None
+    department: Optional[str] = None
+    department_code: Optional[str] = None
+    employee_id: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_superuser: bool = False
+
 # Additional properties stored in DB
 class UserInDB(UserInDBBase):
     hashed_password: str
@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.crud_audit_log import audit_log
+from app.db.session import AsyncSessionLocal
+from app.schemas.audit_log import AuditLogCreate
+from app.services.write_behind import WriteBehindBuffer
+
+# Session.info keys for rows staged by the current unit of work
+_CRITICAL = "audit_critical"
+_BUFFERED = "audit_buffered"
+
+
+class AuditSink(WriteBehindBuffer):
+    """
+    Write-behind sink for audit entries.
+
+    Buffered entries are inserted in multi-row batches when `batch_size`
+    entries are queued or `delay` seconds after the first one, whichever comes
+    first. Critical entries (and every entry when mode is "sync") are written
+    on the caller's session, in the same transaction as the change they record.
+
+    Entries are staged on the session and only leave it in `commit`, so a
+    unit of work that rolls back records nothing.
+    """
+
+    def __init__(self, mode: str, batch_size: int, delay: float):
+        super().__init__(delay)
+        self.mode = mode
+        self.batch_size = batch_size
+        self._queue: List[Dict[str, Any]] = []
+
+    async def record(self, db: AsyncSession, entry: AuditLogCreate, *, critical: bool = False) -> None:
+        await self.record_many(db, [entry], critical=critical)
+
+    async def record_many(
+        self, db: AsyncSession, entries: List[AuditLogCreate], *, critical: bool = False
+    ) -> None:
+        rows = [audit_log.to_row(e) for e in entries]
+        key = _CRITICAL if critical or self.mode == "sync" else _BUFFERED
+        db.info.setdefault(key, []).extend(rows)
+
+    async def commit(self, db: AsyncSession) -> None:
+        """
+        Commit `db` together with the critical entries staged on it (chained
+        and inserted under the chain lock), then queue its buffered entries.
+        """
+        critical = db.info.pop(_CRITICAL, None)
+        buffered = db.info.pop(_BUFFERED, None)
+        if critical:
+            await audit_log.create_multi(db, rows=critical)
+        else:
+            await db.commit()
+        if buffered:
+            self._enqueue(buffered)
+
+    def discard(self, db: AsyncSession) -> None:
+        """Drop entries staged on `db` (its transaction is being rolled back)."""
+        db.info.pop(_CRITICAL, None)
+        db.info.pop(_BUFFERED, None)
+
+    def _enqueue(self, rows: List[Dict[str, Any]]) -> None:
+        self._queue.extend(rows)
+        if len(self._queue) >= self.batch_size:
+            self._flush_soon()
+        else:
+            self._schedule()
+
+    def _take(self) -> Optional[List[Dict[str, Any]]]:
+        if not self._queue:
+            return None
+        rows, self._queue = self._queue, []
+        return rows
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> int:
+        async with AsyncSessionLocal() as db:
+            return await audit_log.create_multi(db, rows=rows)
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        self._queue = rows + self._queue
+
+    def _describe(self, rows: List[Dict[str, Any]]) -> str:
+        return f"{len(rows)} audit log entries"
+
+
+audit_sink = AuditSink(
+    mode=settings.AUDIT_LOG_MODE,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    delay=settings.AUDIT_LOG_FLUSH_SECONDS,
+)
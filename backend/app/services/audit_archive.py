@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import Column, MetaData, Table, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.audit_log import AuditArchiveCheckpoint, AuditLog
+
+
+def month_start(dt: datetime, months_back: int = 0) -> datetime:
+    """First day of the month `months_back` months before `dt`."""
+    index = dt.year * 12 + (dt.month - 1) - months_back
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def archive_table(suffix: str) -> Table:
+    """Monthly archive table with the same columns as audit_logs but no constraints."""
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key, autoincrement=False)
+        for c in AuditLog.__table__.columns
+    ]
+    return Table(f"audit_logs_{suffix}", MetaData(), *columns)
+
+
+def _to_json(row) -> str:
+    data = dict(row._mapping)
+    if data.get("created_at") is not None:
+        data["created_at"] = data["created_at"].isoformat()
+    return json.dumps(data, ensure_ascii=False)
+
+
+async def archive_audit_logs(
+    db: AsyncSession, *, older_than_months: int, mode: str, dry_run: bool = False
+) -> List[Dict]:
+    """
+    Move audit rows created before the start of the month `older_than_months`
+    ago out of the hot table, one calendar month per transaction.
+
+    mode "table" copies each month into `audit_logs_YYYYMM`; mode "ndjson"
+    appends it to a gzip-compressed NDJSON file in AUDIT_ARCHIVE_DIR. The
+    month's last hashed row is recorded in audit_archive_checkpoints in the
+    same transaction, so the remaining rows still verify from there.
+    """
+    cutoff = month_start(datetime.utcnow(), older_than_months)
+    oldest = (await db.execute(select(func.min(AuditLog.created_at)))).scalar()
+    if oldest is None or oldest >= cutoff:
+        return []
+    report: List[Dict] = []
+    start = month_start(oldest)
+    while start < cutoff:
+        end = month_start(start, -1)
+        suffix = start.strftime("%Y%m")
+        in_month = (AuditLog.created_at >= start) & (AuditLog.created_at < end)
+        count = (await db.execute(select(func.count()).select_from(AuditLog).where(in_month))).scalar()
+        if count and not dry_run:
+            if mode == "ndjson":
+                os.makedirs(settings.AUDIT_ARCHIVE_DIR, exist_ok=True)
+                path = os.path.join(settings.AUDIT_ARCHIVE_DIR, f"audit_logs_{suffix}.ndjson.gz")
+                rows = await db.stream(select(AuditLog.__table__).where(in_month).order_by(AuditLog.id))
+                # Appending adds a new gzip member, which readers treat as one stream
+                with gzip.open(path, "at", encoding="utf-8") as fh:
+                    async for row in rows:
+                        fh.write(_to_json(row) + "\n")
+            else:
+                table = archive_table(suffix)
+                await db.run_sync(lambda s: table.create(s.connection(), checkfirst=True))
+                cols = [c.name for c in AuditLog.__table__.columns]
+                await db.execute(
+                    insert(table).from_select(cols, select(AuditLog.__table__).where(in_month))
+                )
+            tail = (await db.execute(
+                select(AuditLog.id, AuditLog.chain_hash)
+                .where(in_month, AuditLog.chain_hash.is_not(None))
+                .order_by(AuditLog.id.desc()).limit(1)
+            )).first()
+            if tail is not None:
+                db.add(AuditArchiveCheckpoint(
+                    month=suffix, mode=mode, rows=count, last_id=tail.id, last_hash=tail.chain_hash
+                ))
+            await db.execute(delete(AuditLog).where(in_month))
+            await db.commit()
+        if count:
+            report.append({"month": suffix, "rows": count, "archived": not dry_run})
+        start = end
+    return report
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.http_cache import DEPARTMENTS, PERMISSIONS, RESEARCH_SUBTYPES, ROLES, resource_versions
+
+_MISSING = object()
+
+
+class CacheBackend:
+    """
+    Storage behind ReferenceCache. Keys are "namespace:key" strings and values
+    are plain JSON-able data, so a shared local store (Redis, memcached, a
+    SQLite file) can implement this instead of the in-process dict.
+    """
+
+    def get(self, key: str) -> Any:
+        """Stored value, or _MISSING when absent or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Drop every key starting with `prefix`; return how many were dropped."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = [k for k in self._data if k.startswith(prefix)]
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class ReferenceCache:
+    """
+    Read-through cache for reference tables, grouped into namespaces that
+    write endpoints invalidate when their unit of work commits. Invalidating
+    bumps the namespace's shared version in that unit of work, and once it
+    commits drops this process's entries and runs any clear hooks registered
+    for it (for caches kept elsewhere, such as the department resolver).
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, namespaces: Tuple[str, ...] = ()):
+        self.backend = backend
+        self.ttl = ttl
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._hooks: Dict[str, List[Callable[[], None]]] = {}
+        self.namespaces = set(namespaces)
+
+    def on_invalidate(self, namespace: str, hook: Callable[[], None]) -> None:
+        self.namespaces.add(namespace)
+        self._hooks.setdefault(namespace, []).append(hook)
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        version: Optional[int] = None,
+    ) -> Any:
+        """
+        Cached value, or the loader's result stored for `ttl` seconds.
+        Concurrent misses load once. Pass the namespace's shared `version`
+        (http_cache.resource_versions) so entries cached before another
+        worker's write are never served after it.
+        """
+        self.namespaces.add(namespace)
+        full = f"{namespace}:{key}" if version is None else f"{namespace}:{version}:{key}"
+        value = self.backend.get(full)
+        if value is not _MISSING:
+            return value
+        lock = self._locks.setdefault(full, asyncio.Lock())
+        async with lock:
+            value = self.backend.get(full)
+            if value is _MISSING:
+                value = await loader()
+                self.backend.set(full, value, self.ttl if ttl is None else ttl)
+        return value
+
+    def invalidate(self, *namespaces: str) -> Dict[str, int]:
+        cleared = {}
+        for ns in namespaces:
+            cleared[ns] = self.backend.delete_prefix(f"{ns}:")
+            for hook in self._hooks.get(ns, []):
+                hook()
+        return cleared
+
+    async def invalidate_on_commit(self, db: AsyncSession, *namespaces: str) -> None:
+        """
+        Bump the namespaces' versions in `db`'s transaction and invalidate
+        locally once it commits; nothing changes if it rolls back.
+        """
+        await resource_versions.bump(db, *namespaces)
+        event.listen(db.sync_session, "after_commit", lambda session: self.invalidate(*namespaces), once=True)
+
+    async def clear(self, db: AsyncSession) -> Dict[str, int]:
+        """
+        Flush every known namespace and bump its version in `db`'s transaction
+        (so every client revalidates); return the number of entries dropped
+        per namespace.
+        """
+        namespaces = sorted(self.namespaces)
+        await resource_versions.bump(db, *namespaces)
+        return self.invalidate(*namespaces)
+
+
+reference_cache = ReferenceCache(
+    MemoryBackend(settings.REFERENCE_CACHE_MAX_ENTRIES),
+    settings.REFERENCE_CACHE_TTL_SECONDS,
+    namespaces=(DEPARTMENTS, RESEARCH_SUBTYPES, PERMISSIONS, ROLES),
+)
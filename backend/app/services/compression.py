@@ -0,0 +1,218 @@
+import gzip
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+from app.services.cache import reference_cache
+
+try:
+    import brotli
+except ImportError:  # br is only offered when brotli is installed
+    brotli = None
+
+# No body, or a partial body that must not be re-encoded
+SKIP_STATUS = {204, 206, 304}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """First of COMPRESSION_ENCODINGS the client accepts with q > 0, or None."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        params = params.strip()
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 0.0
+        accepted[token.strip().lower()] = q
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compressible(content_type: str) -> bool:
+    return any(content_type.startswith(t) for t in settings.COMPRESSION_CONTENT_TYPES)
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """One-shot compression; `best` trades CPU for size on bodies compressed once and cached."""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _stream_compressor(encoding: str) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    if encoding == "br":
+        c = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return c.process, c.finish
+    c = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    return c.compress, c.flush
+
+
+def route_label(scope: dict) -> str:
+    """`METHOD /path/{param}` of the matched route; unmatched paths share one label."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return f"{scope.get('method', '')} (unmatched)"
+    # An included route's template may lack the router prefixes; recover them from the path
+    path = scope.get("path", "")
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        concrete = None
+    if concrete is not None and path.endswith(concrete):
+        template = path[: len(path) - len(concrete)] + template
+    return f"{scope.get('method', '')} {template}"
+
+
+class CompressionStats:
+    """Per-route body bytes before and after compression, for /admin/metrics/compression."""
+
+    def __init__(self):
+        self.routes: Dict[str, Dict[str, int]] = {}
+
+    def record(self, route: str, raw: int, sent: int, compressed: bool) -> None:
+        s = self.routes.get(route)
+        if s is None:
+            s = self.routes[route] = {"responses": 0, "compressed": 0, "bytesIn": 0, "bytesOut": 0}
+        s["responses"] += 1
+        s["compressed"] += int(compressed)
+        s["bytesIn"] += raw
+        s["bytesOut"] += sent
+
+    def snapshot(self) -> List[dict]:
+        out = [
+            {"route": route, **s, "bytesSaved": s["bytesIn"] - s["bytesOut"]}
+            for route, s in self.routes.items()
+        ]
+        return sorted(out, key=lambda r: r["bytesSaved"], reverse=True)
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with the negotiated encoding
+    when the content type is listed in COMPRESSION_CONTENT_TYPES and the body
+    is at least COMPRESSION_MIN_SIZE bytes. Streaming responses are compressed
+    chunk by chunk. Responses that already carry Content-Encoding (see
+    cached_json) are passed through and counted by their producer.
+    """
+
+    def __init__(self, app, *, stats: CompressionStats):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[dict] = None
+        mode: Optional[str] = None  # "plain", "compress" or "encoded", decided on the first body message
+        process = finish = None
+        raw = sent = 0
+
+        async def send_wrapper(message):
+            nonlocal start, mode, process, finish, raw, sent
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                # e.g. http.response.pathsend: nothing to compress
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            headers = None
+            if start is not None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                if "content-encoding" in headers:
+                    mode = "encoded"
+                elif (
+                    encoding is None
+                    or start["status"] in SKIP_STATUS
+                    or not compressible(headers.get("content-type", ""))
+                    or (not more and len(body) < settings.COMPRESSION_MIN_SIZE)
+                ):
+                    mode = "plain"
+                else:
+                    mode = "compress"
+                    process, finish = _stream_compressor(encoding)
+                    if "content-length" in headers:
+                        del headers["content-length"]
+                    headers["content-encoding"] = encoding
+                    headers.add_vary_header("Accept-Encoding")
+            raw += len(body)
+            if mode == "compress":
+                body = process(body) + (b"" if more else finish())
+                message = {"type": "http.response.body", "body": body, "more_body": more}
+            sent += len(body)
+            if headers is not None:
+                if mode == "compress" and not more:
+                    headers["content-length"] = str(len(body))
+                start["headers"] = headers.raw
+                await send(start)
+                start = None
+            if not more and mode != "encoded":
+                self.stats.record(route_label(scope), raw, sent, mode == "compress")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+async def cached_json(
+    request: Request,
+    response: Response,
+    namespace: str,
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+    schema: Any = None,
+    version: Optional[int] = None,
+) -> Response:
+    """
+    Reference data as a ready-to-send JSON response. The rendered body and its
+    compressed variants are cached next to the data (`<key>.json[.<encoding>]`),
+    so they are built once per version of the namespace rather than per
+    request. `schema` renders the body the way the route's response_model would.
+    Headers already set on `response` (ETag, Cache-Control) are kept.
+    """
+
+    async def render() -> bytes:
+        data = await reference_cache.get_or_load(namespace, key, load, version=version)
+        if schema is None:
+            return orjson.dumps(data)
+        adapter = TypeAdapter(schema)
+        return adapter.dump_json(adapter.validate_python(data), by_alias=True)
+
+    raw = await reference_cache.get_or_load(namespace, f"{key}.json", render, version=version)
+    body, encoding = raw, negotiate(request.headers.get("accept-encoding", ""))
+    if encoding is not None and len(raw) >= settings.COMPRESSION_MIN_SIZE:
+        async def precompress() -> bytes:
+            return compress(raw, encoding, best=True)
+
+        body = await reference_cache.get_or_load(namespace, f"{key}.json.{encoding}", precompress, version=version)
+    out = Response(body, media_type="application/json")
+    out.headers.raw.extend(response.headers.raw)
+    if body is not raw:
+        # The middleware passes encoded bodies through, so they are counted here
+        out.headers["Content-Encoding"] = encoding
+        out.headers.add_vary_header("Accept-Encoding")
+        compression_stats.record(route_label(request.scope), len(raw), len(body), True)
+    return out
+
+
+compression_stats = CompressionStats()
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.user import User
+from app.services import profile_summaries
+
+# Bump when the layout below changes so cached files are not reused
+RENDER_VERSION = "2"
+_pool: Optional[ProcessPoolExecutor] = None
+_template_digest: Optional[Tuple[float, str]] = None
+# Cache path -> lock, so concurrent requests for the same CV render it once
+_render_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _heading(doc, text: str) -> None:
+    from docx.shared import Pt
+    p = doc.add_paragraph()
+    p.paragraph_format.space_before = Pt(10)
+    run = p.add_run(text)
+    run.bold = True
+    run.font.size = Pt(13)
+
+
+def render_cv(document: Dict[str, Any], template_path: str, out_path: str) -> str:
+    """
+    Render a profile summary document into a DOCX at `out_path`.
+
+    The template provides page setup, fonts and styles; its sample body is
+    replaced. Runs in a worker process, so it only takes plain data.
+    """
+    from docx import Document
+    from docx.shared import Cm, Pt
+
+    doc = Document(template_path)
+    body = doc.element.body
+    for child in list(body):
+        if not child.tag.endswith("}sectPr"):
+            body.remove(child)
+    for section in doc.sections:
+        section.left_margin = section.right_margin = Cm(2)
+        section.top_margin = section.bottom_margin = Cm(2)
+
+    user = document.get("user") or {}
+    title = doc.add_paragraph().add_run(user.get("full_name") or "")
+    title.bold = True
+    title.font.size = Pt(20)
+    meta = [user.get(k) for k in ("department", "degree", "highest_education", "advisor_qualification")]
+    doc.add_paragraph(" | ".join(str(v) for v in meta if v))
+    if user.get("office_location"):
+        doc.add_paragraph(str(user["office_location"]))
+    if user.get("research_direction"):
+        _heading(doc, "研究方向")
+        doc.add_paragraph(user["research_direction"])
+
+    for kind, label in (("education", "教育经历"), ("work", "工作经历")):
+        rows = [e for e in document.get("experiences") or [] if e.get("type") == kind]
+        if not rows:
+            continue
+        _heading(doc, label)
+        for e in rows:
+            period = f"{e.get('start_date') or ''} - {e.get('end_date') or '至今'}"
+            line = doc.add_paragraph()
+            line.add_run(period + "  ").bold = True
+            line.add_run("  ".join(v for v in (e.get("institution"), e.get("title")) if v))
+            if e.get("description"):
+                doc.add_paragraph(e["description"])
+
+    research = document.get("research") or []
+    if research:
+        _heading(doc, "科研成果")
+        by_category: Dict[str, List[Dict]] = {}
+        for item in research:
+            by_category.setdefault(item.get("category") or "其他", []).append(item)
+        for category, items in by_category.items():
+            doc.add_paragraph().add_run(category).bold = True
+            for n, item in enumerate(items, 1):
+                extra = "，".join(str(v) for k, v in (item.get("content") or {}).items() if k in ("source", "journal", "publisher") and v)
+                role = "" if item.get("role") == "owner" else "（参与）"
+                doc.add_paragraph(f"{n}. {item.get('title')}{role}" + (f"，{extra}" if extra else ""))
+
+    doc.save(out_path)
+    return out_path
+
+
+def _template_hash() -> str:
+    global _template_digest
+    mtime = os.path.getmtime(settings.CV_TEMPLATE_PATH)
+    if _template_digest is None or _template_digest[0] != mtime:
+        with open(settings.CV_TEMPLATE_PATH, "rb") as fh:
+            _template_digest = (mtime, hashlib.sha256(fh.read()).hexdigest())
+    return _template_digest[1]
+
+
+def _cache_path(etag: str) -> str:
+    key = hashlib.sha256(f"{RENDER_VERSION}:{_template_hash()}:{etag}".encode()).hexdigest()
+    return os.path.join(settings.CV_CACHE_DIR, f"{key}.docx")
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.CV_WORKERS)
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _render_cached(document: Dict[str, Any], path: str) -> str:
+    """Render into the content-addressed cache unless the file is already there."""
+    if os.path.exists(path):
+        return path
+    lock = _render_locks.setdefault(path, asyncio.Lock())
+    async with lock:
+        if os.path.exists(path):
+            return path
+        os.makedirs(settings.CV_CACHE_DIR, exist_ok=True)
+        # Unique name in the cache dir: other workers may render the same key,
+        # and os.replace must stay on one filesystem to be atomic
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=settings.CV_CACHE_DIR)
+        os.close(fd)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                _get_pool(), render_cv, document, settings.CV_TEMPLATE_PATH, tmp
+            )
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        finally:
+            _render_locks.pop(path, None)
+    return path
+
+
+async def cv_for_user(db: AsyncSession, user_id: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Path of the user's CV, keyed by the hash of its inputs, plus the summary document."""
+    summary = await profile_summaries.get(db, user_id)
+    if summary is None:
+        return None
+    return await _render_cached(summary.document, _cache_path(summary.etag)), summary.document
+
+
+async def department_zip(db: AsyncSession, department_code: str) -> Optional[str]:
+    """Zip of every CV in a department, rendering missing ones concurrently in the worker pool."""
+    user_ids = (await db.execute(
+        select(User.id).where(User.department_code == department_code).order_by(User.id)
+    )).scalars().all()
+    if not user_ids:
+        return None
+    jobs = []
+    for user_id in user_ids:
+        summary = await profile_summaries.get(db, user_id)
+        if summary is not None:
+            jobs.append((summary.document, _cache_path(summary.etag)))
+    paths = await asyncio.gather(*(_render_cached(doc, path) for doc, path in jobs))
+    fd, zip_path = tempfile.mkstemp(suffix=".zip")
+    os.close(fd)
+    # DOCX files are already deflated, so store them as-is
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        for (doc, _), path in zip(jobs, paths):
+            user = doc.get("user") or {}
+            zf.write(path, arcname=f"{user.get('id')}_{user.get('full_name') or 'cv'}.docx")
+    return zip_path
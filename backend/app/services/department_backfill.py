@@ -0,0 +1,112 @@
+import asyncio
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+from app.services import profile_summaries, research_stats
+from app.services.departments import department_resolver
+
+
+class DepartmentBackfill:
+    """
+    Admin-triggered job that fills users.department_code from the free-text
+    department field, walking users in id order one chunk at a time.
+
+    Each chunk is resolved in memory and written with one UPDATE per distinct
+    code, in one transaction with the research rollup moves and profile
+    summary refreshes for the users whose code changed. A dry run performs
+    the same pass without writing.
+    """
+
+    def __init__(self):
+        self.state: Dict[str, Any] = {"status": "idle"}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, *, dry_run: bool, chunk_size: int, overwrite: bool) -> Dict[str, Any]:
+        self.state = {
+            "status": "running",
+            "dryRun": dry_run,
+            "overwrite": overwrite,
+            "chunkSize": chunk_size,
+            "processed": 0,
+            "matched": 0,
+            "updated": 0,
+            "unmatched": [],
+            "startedAt": datetime.utcnow().isoformat(),
+            "finishedAt": None,
+            "error": None,
+        }
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(dry_run=dry_run, chunk_size=chunk_size, overwrite=overwrite)
+        )
+        return self.state
+
+    async def _run(self, *, dry_run: bool, chunk_size: int, overwrite: bool) -> None:
+        unmatched: Counter = Counter()
+        last_id = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                await department_resolver.refresh(db)
+                while True:
+                    q = (
+                        select(User.id, User.department, User.department_code)
+                        .where(User.id > last_id, User.department.is_not(None), User.department != "")
+                        .order_by(User.id)
+                        .limit(chunk_size)
+                    )
+                    if not overwrite:
+                        q = q.where(User.department_code.is_(None))
+                    rows = (await db.execute(q)).all()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    by_code: Dict[str, List[int]] = defaultdict(list)
+                    changed: List[int] = []
+                    for user_id, department, current in rows:
+                        code = await department_resolver.resolve(db, department)
+                        if code:
+                            by_code[code].append(user_id)
+                            if code != current:
+                                changed.append(user_id)
+                        else:
+                            unmatched[department.strip()] += 1
+                    if not dry_run and changed:
+                        stats_before = await research_stats.owned_contributions(db, changed)
+                        for code, ids in by_code.items():
+                            res = await db.execute(
+                                update(User)
+                                .where(User.id.in_(ids), User.department_code.is_distinct_from(code))
+                                .values(department_code=code)
+                                .execution_options(synchronize_session=False)
+                            )
+                            self.state["updated"] += res.rowcount
+                        await research_stats.apply(
+                            db, stats_before, await research_stats.owned_contributions(db, changed)
+                        )
+                        for user_id in changed:
+                            await profile_summaries.refresh(db, user_id, sections=("user",), create=False)
+                        await db.commit()
+                        db.expunge_all()
+                    self.state["processed"] += len(rows)
+                    self.state["matched"] += sum(len(ids) for ids in by_code.values())
+            self.state["status"] = "finished"
+        except Exception as e:
+            self.state["status"] = "failed"
+            self.state["error"] = str(e)
+        finally:
+            self.state["unmatched"] = [
+                {"department": name, "count": count} for name, count in unmatched.most_common()
+            ]
+            self.state["finishedAt"] = datetime.utcnow().isoformat()
+
+
+department_backfill = DepartmentBackfill()
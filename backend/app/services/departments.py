@@ -0,0 +1,148 @@
+import asyncio
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.department import Department, DepartmentAlias
+from app.services.cache import reference_cache
+from app.services.http_cache import DEPARTMENTS
+
+
+def normalize_name(s: Optional[str]) -> str:
+    """Fold full-width characters, case and all whitespace for comparison."""
+    s = unicodedata.normalize("NFKC", s or "")
+    return "".join(s.split()).lower()
+
+
+def ngrams(s: str, n: int = 2) -> Set[str]:
+    """Character n-grams of an already normalized string."""
+    if len(s) <= n:
+        return {s} if s else set()
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+class DepartmentResolver:
+    """
+    In-memory map from normalized department names and aliases to codes,
+    plus a character bigram index over the same strings for fuzzy suggestions.
+
+    Loaded lazily with two queries, reloaded after a department write commits
+    and, for other workers, after `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._codes: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        # entry = (label, code, number of bigrams); index maps bigram -> entry ids
+        self._entries: List[Tuple[str, str, int]] = []
+        self._index: Dict[str, List[int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def refresh(self, db: AsyncSession) -> None:
+        depts = (await db.execute(select(Department.code, Department.name))).all()
+        aliases = (await db.execute(select(DepartmentAlias.alias, DepartmentAlias.code))).all()
+        codes: Dict[str, str] = {}
+        # Aliases first so that an exact department name always wins
+        for alias, code in aliases:
+            codes[normalize_name(alias)] = code
+        for code, name in depts:
+            codes[normalize_name(name)] = code
+        entries: List[Tuple[str, str, int]] = []
+        index: Dict[str, List[int]] = defaultdict(list)
+        for label, code in [(name, code) for code, name in depts] + list(aliases):
+            grams = ngrams(normalize_name(label))
+            for g in grams:
+                index[g].append(len(entries))
+            entries.append((label, code, len(grams)))
+        self._codes = codes
+        self._names = {code: name for code, name in depts}
+        self._entries = entries
+        self._index = dict(index)
+        self._loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        async with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+                await self.refresh(db)
+
+    async def resolve(self, db: AsyncSession, name: Optional[str]) -> Optional[str]:
+        """Return the department code for a name or alias, or None."""
+        if not name:
+            return None
+        await self.ensure_loaded(db)
+        return self._codes.get(normalize_name(name))
+
+    async def lookup(self, db: AsyncSession, name: Optional[str]) -> Dict[str, Optional[str]]:
+        code = await self.resolve(db, name)
+        if code is None:
+            return {"code": None}
+        if code in self._names:
+            return {"code": code, "name": self._names[code]}
+        return {"code": code}
+
+    def _suggest(self, name: str, limit: int) -> List[Dict]:
+        key = normalize_name(name)
+        exact = self._codes.get(key)
+        if exact is not None:
+            return [{"code": exact, "name": self._names.get(exact), "matched": name, "score": 1.0}]
+        grams = ngrams(key)
+        if not grams:
+            return []
+        hits: Dict[int, int] = defaultdict(int)
+        for g in grams:
+            for entry_id in self._index.get(g, ()):
+                hits[entry_id] += 1
+        # Dice coefficient, keeping the best-scoring label per department code
+        best: Dict[str, Tuple[float, str]] = {}
+        for entry_id, shared in hits.items():
+            label, code, size = self._entries[entry_id]
+            score = 2.0 * shared / (len(grams) + size)
+            if code not in best or score > best[code][0]:
+                best[code] = (score, label)
+        ranked = sorted(best.items(), key=lambda kv: kv[1][0], reverse=True)[:limit]
+        return [
+            {"code": code, "name": self._names.get(code), "matched": label, "score": round(score, 4)}
+            for code, (score, label) in ranked
+        ]
+
+    async def suggest(self, db: AsyncSession, name: str, limit: int = 5) -> List[Dict]:
+        """Top-k department candidates for free-text input, best first."""
+        await self.ensure_loaded(db)
+        return self._suggest(name, limit)
+
+    async def suggest_many(
+        self, db: AsyncSession, names: List[str], min_score: float = 0.0
+    ) -> List[Dict]:
+        """Best candidate for each input name; duplicate inputs are scored once."""
+        await self.ensure_loaded(db)
+        memo: Dict[str, Optional[Dict]] = {}
+        out: List[Dict] = []
+        for name in names:
+            key = normalize_name(name)
+            if key not in memo:
+                top = self._suggest(name, 1)
+                memo[key] = top[0] if top and top[0]["score"] >= min_score else None
+            match = memo[key]
+            out.append({
+                "input": name,
+                "code": match["code"] if match else None,
+                "name": match["name"] if match else None,
+                "score": match["score"] if match else 0.0,
+            })
+        return out
+
+
+department_resolver = DepartmentResolver(ttl=settings.DEPARTMENT_CACHE_TTL_SECONDS)
+reference_cache.on_invalidate(DEPARTMENTS, department_resolver.invalidate)
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.crud_reference_version import reference_version
+from app.db.migrations import head_revision
+from app.models.reference_version import ReferenceVersion
+
+DEPARTMENTS = "departments"
+RESEARCH_SUBTYPES = "research_subtypes"
+PERMISSIONS = "permissions"
+ROLES = "roles"
+
+CACHE_CONTROL = "private, no-cache"
+
+
+class ResourceVersions:
+    """
+    Version numbers for near-static reference data, kept in the
+    reference_versions table and bumped by the write endpoints inside their
+    unit of work, so every worker sees a change as soon as it commits. ETags
+    derive from the version (and the schema head, so data changed by a
+    migration gets new tags); a matching If-None-Match costs one primary-key
+    read.
+    """
+
+    async def get(self, db: AsyncSession, name: str) -> int:
+        version = (await db.execute(select(ReferenceVersion.version).where(ReferenceVersion.name == name))).scalar()
+        return version or 0
+
+    async def bump(self, db: AsyncSession, *names: str) -> None:
+        """Increment the versions in the caller's transaction, creating missing rows."""
+        if not names:
+            return
+        # A missing row starts at 1; an existing one gets 1 added
+        await reference_version.upsert_many(
+            db,
+            rows=[{"name": name, "version": 1} for name in sorted(set(names))],
+            index_elements=["name"],
+            update_fields=["version"],
+            accumulate=True,
+        )
+
+    def etag(self, name: str, version: int) -> str:
+        raw = f"{head_revision()}:{name}:{version}"
+        return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+    def conditional(self, request: Request, response: Response, name: str, version: int) -> Optional[Response]:
+        """
+        Set ETag and Cache-Control on `response`; return a 304 to send instead
+        when the client already holds `version`. Read the version before
+        querying so a concurrent write can only make the tag stale-early.
+        """
+        etag = self.etag(name, version)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        inm = request.headers.get("if-none-match", "")
+        if inm.strip() == "*" or etag in (t.strip() for t in inm.split(",")):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return None
+
+
+resource_versions = ResourceVersions()
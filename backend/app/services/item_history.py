@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+from app.models.research_item import ResearchItem
+
+# History entries are recorded as critical, i.e. inserted with the change they
+# describe: needs_snapshot counts the stored rows and state_at replays them in
+# (created_at, id) order, neither of which holds for rows still in the buffer.
+TARGET_TYPE = "research_item"
+# Columns whose history is kept; content_json is diffed key by key
+TRACKED_FIELDS = ("title", "subtype_id", "status", "file_url", "audit_remarks", "content_json")
+CREATE_ACTION = "创建科研项目"
+SNAPSHOT_ACTION = "科研项目快照"
+SNAPSHOT_ACTIONS = (CREATE_ACTION, SNAPSHOT_ACTION)
+
+
+def _plain(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+def snapshot(item: ResearchItem) -> Dict[str, Any]:
+    """Full tracked state of an item, JSON-ready."""
+    return {f: _plain(getattr(item, f, None)) for f in TRACKED_FIELDS}
+
+
+def _flatten(state: Dict[str, Any]) -> Dict[str, Any]:
+    flat: Dict[str, Any] = {}
+    for field in TRACKED_FIELDS:
+        value = state.get(field)
+        if field == "content_json" and isinstance(value, dict):
+            for k, v in value.items():
+                flat[f"content_json.{k}"] = v
+        elif field in state:
+            flat[field] = value
+    return flat
+
+
+def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Field-level diff between two states as (old_value, new_value) maps that
+    only hold changed keys. A key present in old_value but missing from
+    new_value was removed.
+    """
+    a, b = _flatten(old), _flatten(new)
+    changed = [k for k in a.keys() | b.keys() if a.get(k) != b.get(k) or (k in a) != (k in b)]
+    return {k: a[k] for k in changed if k in a}, {k: b[k] for k in changed if k in b}
+
+
+def apply(state: Dict[str, Any], old_value: Optional[Dict], new_value: Optional[Dict]) -> Dict[str, Any]:
+    """Replay one stored diff onto a state."""
+    for key in set(old_value or {}) | set(new_value or {}):
+        field, _, sub = key.partition(".")
+        if field not in TRACKED_FIELDS:
+            continue
+        present = new_value is not None and key in new_value
+        if sub:
+            content = dict(state.get("content_json") or {})
+            if present:
+                content[sub] = new_value[key]
+            else:
+                content.pop(sub, None)
+            state["content_json"] = content
+        else:
+            state[field] = new_value[key] if present else None
+    return state
+
+
+async def needs_snapshot(db: AsyncSession, item_id: int) -> bool:
+    """True when the next history entry should be followed by a full snapshot."""
+    count = (await db.execute(
+        select(func.count()).select_from(AuditLog)
+        .where(AuditLog.target_type == TARGET_TYPE, AuditLog.target_id == item_id)
+    )).scalar()
+    return bool(count) and count % settings.AUDIT_SNAPSHOT_INTERVAL == 0
+
+
+def _target(item_id: int):
+    return (AuditLog.target_type == TARGET_TYPE) & (AuditLog.target_id == item_id)
+
+
+async def list_history(db: AsyncSession, item_id: int) -> List[AuditLog]:
+    res = await db.execute(
+        select(AuditLog).where(_target(item_id)).order_by(AuditLog.created_at, AuditLog.id)
+    )
+    return res.scalars().all()
+
+
+async def state_at(db: AsyncSession, item_id: int, at: datetime) -> Optional[Dict[str, Any]]:
+    """Rebuild an item as of `at` from the nearest snapshot plus the diffs after it."""
+    snap = (await db.execute(
+        select(AuditLog)
+        .where(_target(item_id), AuditLog.action.in_(SNAPSHOT_ACTIONS), AuditLog.created_at <= at)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .limit(1)
+    )).scalars().first()
+    if snap is None:
+        return None
+    state = {f: (snap.new_value or {}).get(f) for f in TRACKED_FIELDS}
+    res = await db.execute(
+        select(AuditLog)
+        .where(
+            _target(item_id),
+            AuditLog.created_at <= at,
+            (AuditLog.created_at > snap.created_at)
+            | ((AuditLog.created_at == snap.created_at) & (AuditLog.id > snap.id)),
+        )
+        .order_by(AuditLog.created_at, AuditLog.id)
+    )
+    for entry in res.scalars().all():
+        apply(state, entry.old_value, entry.new_value)
+    return state
@@ -0,0 +1,147 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.models.research_collaborator import ResearchCollaborator
+from app.models.research_item import ResearchItem, ApprovalStatus
+from app.models.research_type import ResearchSubtype
+from app.models.user import User
+from app.models.user_experience import UserExperience
+from app.models.user_profile_summary import UserProfileSummary
+
+SECTIONS = ("user", "experiences", "research")
+# Published to anyone who can see the profile, so no contact or staff identifiers
+PROFILE_FIELDS = (
+    "id", "full_name", "department", "department_code", "gender",
+    "office_location", "highest_education", "degree", "alma_mater", "major",
+    "research_direction", "advisor_qualification", "profile_public",
+)
+# content_json keys kept out of the published document
+PRIVATE_CONTENT_KEYS = {"funding"}
+
+
+def _iso(v: Any) -> Any:
+    return v.isoformat() if hasattr(v, "isoformat") else v
+
+
+def _user_section(user: User) -> Dict[str, Any]:
+    return {f: _iso(getattr(user, f, None)) for f in PROFILE_FIELDS}
+
+
+async def _experiences_section(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+    res = await db.execute(
+        select(UserExperience)
+        .where(UserExperience.user_id == user_id)
+        .order_by(UserExperience.order_index.is_(None), UserExperience.order_index, UserExperience.start_date)
+    )
+    return [
+        {
+            "type": e.type, "start_date": _iso(e.start_date), "end_date": _iso(e.end_date),
+            "title": e.title, "institution": e.institution, "description": e.description,
+        }
+        for e in res.scalars().all()
+    ]
+
+
+async def _research_section(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+    """Approved items the user owns or collaborates on, newest first."""
+    collaborated = select(ResearchCollaborator.item_id).where(ResearchCollaborator.user_id == user_id)
+    res = await db.execute(
+        select(ResearchItem)
+        .options(selectinload(ResearchItem.subtype).selectinload(ResearchSubtype.type))
+        .where(
+            (ResearchItem.user_id == user_id) | ResearchItem.id.in_(collaborated),
+            ResearchItem.status == ApprovalStatus.approved,
+        )
+        .order_by(ResearchItem.approve_time.desc(), ResearchItem.id.desc())
+    )
+    return [
+        {
+            "id": i.id,
+            "title": i.title,
+            "category": i.category,
+            "role": "owner" if i.user_id == user_id else "collaborator",
+            "approve_time": _iso(i.approve_time),
+            "content": {k: v for k, v in (i.content_json or {}).items() if k not in PRIVATE_CONTENT_KEYS},
+        }
+        for i in res.scalars().all()
+    ]
+
+
+async def refresh(
+    db: AsyncSession,
+    user_id: int,
+    *,
+    sections: Iterable[str] = SECTIONS,
+    user: Optional[User] = None,
+    create: bool = True,
+) -> Optional[UserProfileSummary]:
+    """
+    Rebuild the given sections of a user's summary, keep the rest, bump
+    version and ETag. With create=False, users without a summary yet are left
+    for the first read to build.
+    """
+    row = await db.get(UserProfileSummary, user_id)
+    if row is None and not create:
+        return None
+    sections = set(sections) if row is not None else set(SECTIONS)
+    if user is None and "user" in sections:
+        user = await db.get(User, user_id)
+        if user is None:
+            return None
+    doc = dict(row.document) if row is not None else {}
+    if "user" in sections:
+        doc["user"] = _user_section(user)
+    if "experiences" in sections:
+        doc["experiences"] = await _experiences_section(db, user_id)
+    if "research" in sections:
+        doc["research"] = await _research_section(db, user_id)
+    etag = hashlib.sha256(json.dumps(doc, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    if row is None:
+        row = UserProfileSummary(user_id=user_id, version=1)
+        db.add(row)
+    elif row.etag == etag:
+        return row
+    else:
+        row.version = (row.version or 0) + 1
+    row.document = doc
+    row.etag = etag
+    row.is_public = bool(doc["user"].get("profile_public"))
+    row.department_code = doc["user"].get("department_code")
+    await db.flush()
+    return row
+
+
+async def get(db: AsyncSession, user_id: int) -> Optional[UserProfileSummary]:
+    """Cached summary, built on first access."""
+    row = await db.get(UserProfileSummary, user_id)
+    return row if row is not None else await refresh(db, user_id)
+
+
+async def users_for_items(db: AsyncSession, item_ids: Iterable[int]) -> Set[int]:
+    """Owners and collaborators of the given items (call before deleting them)."""
+    item_ids = list(item_ids)
+    if not item_ids:
+        return set()
+    stmt = union(
+        select(ResearchItem.user_id).where(ResearchItem.id.in_(item_ids)),
+        select(ResearchCollaborator.user_id).where(ResearchCollaborator.item_id.in_(item_ids)),
+    )
+    return {r[0] for r in (await db.execute(stmt)).all()}
+
+
+async def refresh_research(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    for user_id in user_ids:
+        await refresh(db, user_id, sections=("research",), create=False)
+
+
+async def rebuild_all(db: AsyncSession) -> int:
+    user_ids = (await db.execute(select(User.id).order_by(User.id))).scalars().all()
+    for user_id in user_ids:
+        await refresh(db, user_id)
+    return len(user_ids)
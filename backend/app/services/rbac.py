@@ -0,0 +1,80 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.reference_data import SYSTEM_ROLE_NAMES
+from app.models.rbac import Role, RolePermission, UserRole
+from app.services.cache import reference_cache
+from app.services.http_cache import ROLES, resource_versions
+
+
+class RolePermissionMap:
+    """
+    Role id -> permission codes, compiled from a single query over
+    role_permissions, for deps.require_permission. Tagged with the roles
+    namespace's shared version and recompiled when another worker (or this
+    one) has bumped it since.
+    """
+
+    def __init__(self):
+        self._map: Optional[Dict[int, FrozenSet[str]]] = None
+        self._version: Optional[int] = None
+
+    def invalidate(self) -> None:
+        self._map = None
+
+    async def refresh(self, db: AsyncSession, version: Optional[int] = None) -> Dict[int, FrozenSet[str]]:
+        if version is None:
+            version = await resource_versions.get(db, ROLES)
+        rows = (await db.execute(select(RolePermission.role_id, RolePermission.code))).all()
+        compiled: Dict[int, set] = {}
+        for role_id, code in rows:
+            compiled.setdefault(role_id, set()).add(code)
+        self._map = {role_id: frozenset(codes) for role_id, codes in compiled.items()}
+        self._version = version
+        return self._map
+
+    async def get(self, db: AsyncSession) -> Dict[int, FrozenSet[str]]:
+        version = await resource_versions.get(db, ROLES)
+        if self._map is None or self._version != version:
+            return await self.refresh(db, version)
+        return self._map
+
+
+role_permissions = RolePermissionMap()
+reference_cache.on_invalidate(ROLES, role_permissions.invalidate)
+
+
+async def set_user_roles(db: AsyncSession, user_id: int, role_ids: Iterable[int]) -> List[int]:
+    """Replace a user's role assignments with one DELETE and one INSERT ... SELECT over existing roles."""
+    role_ids = sorted(set(role_ids))
+    await db.execute(delete(UserRole).where(UserRole.user_id == user_id))
+    if role_ids:
+        await db.execute(
+            insert(UserRole).from_select(
+                ["user_id", "role_id"],
+                select(literal(user_id), Role.id).where(Role.id.in_(role_ids)),
+            )
+        )
+    return await get_user_role_ids(db, user_id)
+
+
+async def get_user_role_ids(db: AsyncSession, user_id: int) -> List[int]:
+    res = await db.execute(select(UserRole.role_id).where(UserRole.user_id == user_id).order_by(UserRole.role_id))
+    return list(res.scalars().all())
+
+
+async def sync_system_role(db: AsyncSession, user_id: int, role: Optional[str]) -> None:
+    """Point the user's system role assignment at the one matching users.role, keeping custom roles."""
+    system_ids = select(Role.id).where(Role.is_system.is_(True))
+    await db.execute(delete(UserRole).where(UserRole.user_id == user_id, UserRole.role_id.in_(system_ids)))
+    name = SYSTEM_ROLE_NAMES.get(role or "")
+    if name is not None:
+        await db.execute(
+            insert(UserRole).from_select(
+                ["user_id", "role_id"],
+                select(literal(user_id), Role.id).where(Role.is_system.is_(True), Role.name == name),
+            )
+        )
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.crud.crud_notice_recipient import notice_recipient
+from app.db.session import AsyncSessionLocal
+from app.services.write_behind import WriteBehindBuffer
+
+_Batch = Tuple[Dict[int, Set[int]], Dict[int, datetime]]
+
+
+class ReadReceiptBuffer(WriteBehindBuffer):
+    """
+    Write-behind buffer for notice read receipts.
+
+    Clicks arriving within `delay` seconds are coalesced so that each user's
+    burst turns into a single UPDATE, all committed in one transaction.
+    """
+
+    def __init__(self, delay: float):
+        super().__init__(delay)
+        self._pending: Dict[int, Set[int]] = {}
+        self._read_at: Dict[int, datetime] = {}
+
+    def add(self, user_id: int, notice_id: int) -> None:
+        self._pending.setdefault(user_id, set()).add(notice_id)
+        self._read_at.setdefault(user_id, datetime.utcnow())
+        self._schedule()
+
+    def _take(self) -> Optional[_Batch]:
+        if not self._pending:
+            return None
+        batch = (self._pending, self._read_at)
+        self._pending, self._read_at = {}, {}
+        return batch
+
+    async def _write(self, batch: _Batch) -> int:
+        pending, read_at = batch
+        updated = 0
+        async with AsyncSessionLocal() as db:
+            for user_id, notice_ids in pending.items():
+                updated += await notice_recipient.mark_read_multi(
+                    db, user_id=user_id, notice_ids=notice_ids, read_at=read_at[user_id]
+                )
+            await db.commit()
+        return updated
+
+    def _requeue(self, batch: _Batch) -> None:
+        pending, read_at = batch
+        for user_id, notice_ids in pending.items():
+            self._pending.setdefault(user_id, set()).update(notice_ids)
+            self._read_at[user_id] = min(read_at[user_id], self._read_at.get(user_id, read_at[user_id]))
+
+    def _describe(self, batch: _Batch) -> str:
+        return f"read receipts for {len(batch[0])} users"
+
+
+read_receipts = ReadReceiptBuffer(delay=settings.NOTICE_READ_FLUSH_SECONDS)
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.crud_research_stat import research_stat
+from app.models.research_item import ResearchItem, ApprovalStatus, subtype_category
+from app.models.research_stat import ResearchStat
+from app.models.research_type import ResearchSubtype, ResearchType
+from app.models.user import User
+
+Key = Tuple[str, str, str, int]
+KEY_FIELDS = ("department_code", "category", "status", "year")
+MEASURES = ("item_count", "funding_total", "turnaround_count", "turnaround_seconds")
+
+
+def _funding(content) -> float:
+    try:
+        return float((content or {}).get("funding") or 0)
+    except (TypeError, ValueError, AttributeError):
+        return 0.0
+
+
+def _item_rows():
+    return (
+        select(
+            ResearchItem.id, ResearchItem.status, ResearchItem.created_at, ResearchItem.approve_time,
+            ResearchItem.content_json, User.department_code, ResearchSubtype.name, ResearchType.name,
+        )
+        .join(User, User.id == ResearchItem.user_id)
+        .join(ResearchSubtype, ResearchSubtype.id == ResearchItem.subtype_id)
+        .outerjoin(ResearchType, ResearchType.id == ResearchSubtype.type_id)
+    )
+
+
+def _contribution(row) -> Tuple[Key, Tuple[int, float, int, int]]:
+    _, status, created_at, approve_time, content, dept, subtype_name, type_name = row
+    status = status.value if hasattr(status, "value") else (status or ApprovalStatus.draft.value)
+    key = (dept or "", subtype_category(subtype_name, type_name), status, created_at.year if created_at else 0)
+    approved, turnaround = 0, 0
+    if status == ApprovalStatus.approved.value and approve_time and created_at:
+        approved = 1
+        turnaround = max(int((approve_time.replace(tzinfo=None) - created_at.replace(tzinfo=None)).total_seconds()), 0)
+    return key, (1, _funding(content), approved, turnaround)
+
+
+async def contributions(db: AsyncSession, ids: Iterable[int]) -> Dict[int, Tuple[Key, Tuple]]:
+    """What each item currently adds to the rollup; call before and after a write."""
+    ids = list(ids)
+    if not ids:
+        return {}
+    rows = (await db.execute(_item_rows().where(ResearchItem.id.in_(ids)))).all()
+    return {row[0]: _contribution(row) for row in rows}
+
+
+async def owned_contributions(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, Tuple[Key, Tuple]]:
+    """
+    What the items owned by the given users add to the rollup. Items are
+    bucketed by their owner's department, so call before and after changing
+    a users.department_code and `apply` the difference.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    rows = (await db.execute(_item_rows().where(ResearchItem.user_id.in_(user_ids)))).all()
+    return {row[0]: _contribution(row) for row in rows}
+
+
+async def _upsert(db: AsyncSession, rows: List[Dict]) -> None:
+    """Add measure deltas onto existing rollup rows, inserting missing keys."""
+    await research_stat.upsert_many(db, rows=rows, index_elements=KEY_FIELDS, update_fields=MEASURES, accumulate=True)
+
+
+async def apply(db: AsyncSession, before: Dict, after: Dict) -> None:
+    """Apply the difference between two `contributions` results in the caller's transaction."""
+    deltas: Dict[Key, List[float]] = defaultdict(lambda: [0, 0.0, 0, 0])
+    for sign, side in ((-1, before), (1, after)):
+        for key, values in side.values():
+            for i, v in enumerate(values):
+                deltas[key][i] += sign * v
+    rows = [
+        dict(zip(KEY_FIELDS, key), **dict(zip(MEASURES, values)))
+        for key, values in deltas.items()
+        if any(values)
+    ]
+    if rows:
+        await _upsert(db, rows)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Recompute the whole rollup from research_items in one streamed pass."""
+    totals: Dict[Key, List[float]] = defaultdict(lambda: [0, 0.0, 0, 0])
+    result = await db.stream(_item_rows().execution_options(yield_per=1000))
+    async for row in result:
+        key, values = _contribution(row)
+        for i, v in enumerate(values):
+            totals[key][i] += v
+    await db.execute(delete(ResearchStat))
+    if totals:
+        await _upsert(db, [
+            dict(zip(KEY_FIELDS, key), **dict(zip(MEASURES, values)))
+            for key, values in totals.items()
+        ])
+    return len(totals)
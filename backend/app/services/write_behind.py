@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Scheduling shared by the write-behind buffers (audit entries, notice read
+    receipts): a flush `delay` seconds after the first queued item, immediate
+    flushes on demand, re-queueing of failed batches and draining on close.
+
+    Subclasses hold the pending items and implement `_take`, `_write`,
+    `_requeue` and `_describe`.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._timer: Optional[asyncio.Task] = None
+        self._writing = False
+        self._flushes: List[asyncio.Task] = []
+
+    def _take(self) -> Any:
+        """Remove and return everything pending, or None when there is nothing."""
+        raise NotImplementedError
+
+    async def _write(self, batch: Any) -> int:
+        """Write a batch taken by `_take` in its own transaction; return the row count."""
+        raise NotImplementedError
+
+    def _requeue(self, batch: Any) -> None:
+        """Put a batch that failed to write back in front of what is pending."""
+        raise NotImplementedError
+
+    def _describe(self, batch: Any) -> str:
+        raise NotImplementedError
+
+    def _schedule(self) -> None:
+        """Start the delayed flush unless one is already waiting."""
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    def _flush_soon(self) -> None:
+        """Flush now in the background; close() waits for it."""
+        self._flushes = [t for t in self._flushes if not t.done()]
+        self._flushes.append(asyncio.get_running_loop().create_task(self.flush()))
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.delay)
+        # From here on the batch is out of the buffer: close() waits, not cancels
+        self._writing = True
+        try:
+            await self.flush()
+        finally:
+            self._writing = False
+
+    async def flush(self) -> int:
+        """Write everything pending now; failed batches are re-queued."""
+        batch = self._take()
+        if batch is None:
+            return 0
+        try:
+            return await self._write(batch)
+        except Exception:
+            logger.exception("Failed to write %s, re-queued", self._describe(batch))
+            self._requeue(batch)
+            return 0
+        except BaseException:
+            self._requeue(batch)
+            raise
+
+    async def close(self) -> None:
+        """
+        Wait for in-flight batches and drain the buffer (used on shutdown). A
+        timer still waiting out its delay is cancelled; one already writing
+        is awaited.
+        """
+        timer, self._timer = self._timer, None
+        if timer is not None and not timer.done():
+            if not self._writing:
+                timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+            self._flushes = []
+        await self.flush()
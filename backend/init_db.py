@@ -20,6 +20,9 @@ from app.models.research_type import ResearchType, ResearchSubtype
 from app.models.research_item import ResearchItem
 from app.models.research_collaborator import ResearchCollaborator
 from app.models.audit_log import AuditLog
+import app.models  # noqa: F401  注册全部模型
+from app.db import reference_data
+from app.db.migrations import stamp_head
 from app.core.security import get_password_hash
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy import text
@@ -49,8 +52,11 @@ async def create_database_tables(engine: AsyncEngine):
             # 继续执行，不中断流程
             await conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
         
-        # 然后使用模型创建所有表
+        # 然后使用模型创建所有表，并标记为最新的迁移版本
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(stamp_head)
+        # 标记为最新版本不会执行迁移里的数据，这里补上学院、系统角色及其权限、权限目录和科研类型
+        await conn.run_sync(reference_data.seed)
     print("数据库表创建完成")
 
 async def seed_sample_data():
@@ -153,8 +159,8 @@ async def main():
     
     try:
         # 创建数据库表
-        from app.db.session import engine
-        await create_database_tables(engine)
+        from app.db.session import init_engine
+        await create_database_tables(init_engine())
         
         # 填充示例数据
         if not await seed_sample_data():
@@ -0,0 +1,118 @@
+"""
+Benchmark the "my research" list (items a user owns or collaborates on).
+
+Builds a SQLite database from the models at each table size, with about 50
+owned items and 50 collaborations per user, and times one page of a random
+user's list three ways: the former `user_id = ? OR id IN (subquery)` filter,
+the UNION of index range scans behind /research/user/{id}, and that UNION
+resumed from a keyset cursor halfway through the user's items.
+
+    python scripts/bench_my_research.py [--sizes 10000,100000,1000000] [--users 50] [--db bench.sqlite]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy import create_engine, or_, select  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.crud.crud_research_item import research_item  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.research_collaborator import ResearchCollaborator  # noqa: E402
+from app.models.research_item import ResearchItem  # noqa: E402
+
+PAGE = 100
+CHUNK = 50000
+COLUMNS = (ResearchItem.id, ResearchItem.title, ResearchItem.status, ResearchItem.created_at)
+
+
+def build(engine, size: int, rng: random.Random) -> int:
+    """Fresh schema with `size` items and as many collaborator rows; returns the number of users."""
+    users = max(size // 50, 10)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO research_types (id, name) VALUES (1, '项目')")
+        conn.exec_driver_sql("INSERT INTO research_subtypes (id, name, type_id) VALUES (1, '纵向科研项目', 1)")
+        for start in range(1, size + 1, CHUNK):
+            stop = min(start + CHUNK, size + 1)
+            conn.exec_driver_sql(
+                "INSERT INTO research_items (id, title, user_id, subtype_id, status, created_at) "
+                "VALUES (?, ?, ?, 1, 'pending', '2026-01-01 00:00:00')",
+                [(i, f"item {i}", rng.randrange(1, users + 1)) for i in range(start, stop)],
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO research_collaborators (item_id, user_id) VALUES (?, ?)",
+                [(rng.randrange(1, size + 1), rng.randrange(1, users + 1)) for _ in range(start, stop)],
+            )
+        conn.exec_driver_sql("ANALYZE")
+    return users
+
+
+def legacy(user_id: int):
+    collaborated = select(ResearchCollaborator.item_id).where(ResearchCollaborator.user_id == user_id)
+    return select(*COLUMNS).where(or_(ResearchItem.user_id == user_id, ResearchItem.id.in_(collaborated)))\
+        .order_by(ResearchItem.id).limit(PAGE)
+
+
+def union(user_id: int, after=None):
+    mine = research_item.ids_for_user(user_id, after=after, limit=PAGE)
+    return select(*COLUMNS, mine.c.relation).join(mine, mine.c.item_id == ResearchItem.id)\
+        .order_by(ResearchItem.id).limit(PAGE)
+
+
+def timed(conn, stmt) -> float:
+    t0 = time.perf_counter()
+    conn.execute(stmt).all()
+    return (time.perf_counter() - t0) * 1000
+
+
+def midpoint(conn, user_id: int) -> int:
+    """An id halfway through the user's items, as a cursor from an earlier page would be."""
+    stmt = select(ResearchItem.id).where(ResearchItem.user_id == user_id).order_by(ResearchItem.id)
+    ids = conn.execute(stmt).scalars().all()
+    return ids[len(ids) // 2] if ids else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated item counts")
+    parser.add_argument("--users", type=int, default=50, help="random users timed per size")
+    parser.add_argument("--db", help="SQLite file to build in (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "bench_my_research.sqlite")
+    engine = create_engine(f"sqlite:///{path}")
+    rng = random.Random(args.seed)
+    print(f"{'items':>9}  {'OR filter':>17}  {'UNION':>17}  {'UNION, cursor':>17}   (median / p95 ms, {PAGE} rows)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        users = build(engine, size, rng)
+        sample = [rng.randrange(1, users + 1) for _ in range(args.users)]
+        times = {"legacy": [], "union": [], "cursor": []}
+        with engine.connect() as conn:
+            for user_id in sample:
+                after = midpoint(conn, user_id)
+                times["legacy"].append(timed(conn, legacy(user_id)))
+                times["union"].append(timed(conn, union(user_id)))
+                times["cursor"].append(timed(conn, union(user_id, after)))
+        cells = []
+        for key in ("legacy", "union", "cursor"):
+            values = sorted(times[key])
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            cells.append(f"{statistics.median(values):7.2f} / {p95:7.2f}")
+        print(f"{size:>9}  " + "  ".join(cells))
+    engine.dispose()
+    if not args.db:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Cold-start benchmark for the API worker.
+
+Imports app.main in fresh interpreters under `python -X importtime` and
+reports the median total import time plus the slowest modules, then times
+the lifespan startup (engine creation and schema version check) against the
+configured database. --report also writes the output to a file;
+docs/perf/startup.md holds the before/after reports for the lazy-loading
+change and how they were produced.
+
+    python scripts/bench_startup.py [--runs 5] [--top 25] [--report startup.txt]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+READY_SNIPPET = """
+import asyncio, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+t2 = asyncio.run(boot())
+print(f"{(t1 - t0) * 1000:.1f} {(t2 - t0) * 1000:.1f}")
+"""
+
+
+def import_profile():
+    """One `-X importtime` run: {module: (self_us, cumulative_us)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1])
+    mods = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        mods[name.strip()] = (int(self_us), int(cum_us))
+    return mods
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--report", help="also write the output to this file")
+    args = parser.parse_args()
+
+    lines = []
+
+    def out(text=""):
+        print(text)
+        lines.append(text)
+
+    totals = []
+    cumulative = defaultdict(list)
+    for _ in range(args.runs):
+        mods = import_profile()
+        totals.append(mods["app.main"][1])
+        for name, (_, cum) in mods.items():
+            cumulative[name].append(cum)
+
+    out(f"import app.main: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs "
+        f"(min {min(totals) / 1000:.1f}, max {max(totals) / 1000:.1f})")
+    out(f"\nslowest modules by median cumulative import time (top {args.top}):")
+    ranked = sorted(cumulative.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)
+    for name, values in ranked[1:args.top + 1]:
+        out(f"  {statistics.median(values) / 1000:8.1f} ms  {name}")
+    out("\nlazily loaded (must not appear above): app.api.endpoints.logs/admin/rbac, alembic, passlib, docx")
+    loaded = [m for m in ("app.api.endpoints.logs", "app.api.endpoints.admin", "app.api.endpoints.rbac",
+                          "alembic", "passlib", "docx") if m in cumulative]
+    out(f"  imported at boot: {', '.join(loaded) or 'none'}")
+
+    proc = subprocess.run([sys.executable, "-c", READY_SNIPPET], cwd=BASE_DIR, capture_output=True, text=True)
+    if proc.returncode == 0:
+        imported, ready = proc.stdout.split()
+        out(f"\ntime to ready (import + lifespan startup): {ready} ms (import {imported} ms)")
+    else:
+        out(f"\ntime to ready: skipped, startup failed: {proc.stderr.strip().splitlines()[-1]}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
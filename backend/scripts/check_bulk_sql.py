@@ -0,0 +1,111 @@
+"""
+Check the SQL behind CRUDBase.bulk_create, bulk_update and upsert_many.
+
+Compiles each upsert_many variant (replace, accumulate, leave collisions
+alone) for the SQLite and MySQL dialects and fails when the ON CONFLICT /
+ON DUPLICATE KEY clause is not the expected one, then runs all three
+helpers against an in-memory SQLite database on research_stats and checks
+the rows they leave behind.
+
+    python scripts/check_bulk_sql.py [--verbose]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy.dialects import mysql, sqlite  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.future import select  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.crud.crud_research_stat import research_stat  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.research_stat import ResearchStat  # noqa: E402
+
+KEY = ("department_code", "category", "status", "year")
+ROW = {"department_code": "CS", "category": "学术论文", "status": "approved", "year": 2026,
+       "item_count": 1, "funding_total": 2.5, "turnaround_count": 1, "turnaround_seconds": 60}
+DIALECTS = {"sqlite": sqlite.dialect(), "mysql": mysql.dialect()}
+
+
+def statements():
+    """(label, dialect, upsert_stmt kwargs, fragments the SQL must contain)."""
+    return [
+        ("upsert, replace", "sqlite", {"update_fields": ["item_count"]},
+         ["ON CONFLICT (department_code, category, status, year) DO UPDATE SET item_count = excluded.item_count"]),
+        ("upsert, replace", "mysql", {"update_fields": ["item_count"]},
+         ["ON DUPLICATE KEY UPDATE item_count = VALUES(item_count)"]),
+        ("upsert, accumulate", "sqlite", {"update_fields": ["item_count"], "accumulate": True},
+         ["DO UPDATE SET item_count = (research_stats.item_count + excluded.item_count)"]),
+        ("upsert, accumulate", "mysql", {"update_fields": ["item_count"], "accumulate": True},
+         ["ON DUPLICATE KEY UPDATE item_count = (research_stats.item_count + VALUES(item_count))"]),
+        ("upsert, keep existing", "sqlite", {"update_fields": []},
+         ["ON CONFLICT (department_code, category, status, year) DO NOTHING"]),
+        ("upsert, keep existing", "mysql", {"update_fields": []},
+         ["ON DUPLICATE KEY UPDATE department_code = VALUES(department_code)"]),
+    ]
+
+
+async def run_sqlite():
+    """(label, ok, detail) for each helper executed against SQLite."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    results = []
+
+    async def stored(db):
+        return {r.year: r for r in (await db.scalars(select(ResearchStat).order_by(ResearchStat.year))).all()}
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        created = await research_stat.bulk_create(db, objs_in=[dict(ROW, year=y) for y in (2024, 2025)])
+        results.append(("bulk_create", len(created) == 2 and all(o.id for o in created), f"{len(created)} rows"))
+
+        await research_stat.bulk_update(db, rows=[{"id": o.id, "item_count": 10} for o in created])
+        rows = await stored(db)
+        results.append(("bulk_update", [r.item_count for r in rows.values()] == [10, 10],
+                        str([r.item_count for r in rows.values()])))
+
+        await research_stat.upsert_many(db, rows=[dict(ROW, year=2024, item_count=3), dict(ROW, year=2026)],
+                                        index_elements=KEY, update_fields=["item_count"], accumulate=True)
+        rows = await stored(db)
+        counts = {y: r.item_count for y, r in rows.items()}
+        results.append(("upsert_many, accumulate", counts == {2024: 13, 2025: 10, 2026: 1}, str(counts)))
+
+        await research_stat.upsert_many(db, rows=[dict(ROW, year=2025, item_count=7)],
+                                        index_elements=KEY, update_fields=["item_count"])
+        await research_stat.upsert_many(db, rows=[dict(ROW, year=2026, item_count=99)],
+                                        index_elements=KEY, update_fields=[])
+        rows = await stored(db)
+        counts = {y: r.item_count for y, r in rows.items()}
+        results.append(("upsert_many, replace / keep existing", counts == {2024: 13, 2025: 7, 2026: 1}, str(counts)))
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every compiled statement")
+    args = parser.parse_args()
+
+    failed = 0
+    for label, name, kwargs, fragments in statements():
+        stmt = research_stat.upsert_stmt(name, index_elements=KEY, **kwargs).values(ROW)
+        sql = " ".join(str(stmt.compile(dialect=DIALECTS[name])).split())
+        missing = [f for f in fragments if f not in sql]
+        failed += bool(missing)
+        print(f"{'FAIL' if missing else 'ok  '}  {label} ({name})" + (f": missing {missing}" if missing else ""))
+        if missing or args.verbose:
+            print(f"        {sql}")
+
+    for label, ok, detail in asyncio.run(run_sqlite()):
+        failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'}  {label} (sqlite, executed)" + ("" if ok else f": {detail}"))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Check read/write routing against a primary and a replica SQLite file.
+
+Builds two databases from the models with the same users, adds one research
+item that exists only on the primary, and drives the app through its ASGI
+interface with the replica configured. It fails unless:
+
+  - reads without a token are served by the replica,
+  - a write returns X-Primary-Until and reads echoing it see the primary,
+  - a fresh router (another worker) accepts that token,
+  - tampered or expired tokens are ignored,
+  - reads fall back to the primary while the replica is marked down.
+
+    python scripts/check_replica_routing.py [--dir /tmp/replica-check]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+PASSWORD = "check-routing"
+
+
+def build(path: str) -> None:
+    """Schema at head plus an admin user and one subtype, as on a real replica."""
+    from sqlalchemy import create_engine, text
+
+    import app.models  # noqa: F401
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+    from app.db.migrations import stamp_head
+
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        stamp_head(conn)
+        conn.execute(
+            text("INSERT INTO users (id, email, hashed_password, full_name, is_active, is_superuser, role) "
+                 "VALUES (1, 'admin@example.com', :h, 'Admin', 1, 1, 'sys_admin')"),
+            {"h": get_password_hash(PASSWORD)},
+        )
+        conn.execute(text("INSERT INTO research_types (id, name) VALUES (1, '项目')"))
+        conn.execute(text("INSERT INTO research_subtypes (id, name, type_id) VALUES (1, '纵向科研项目', 1)"))
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", help="directory for the two SQLite files (default: a temporary one)")
+    args = parser.parse_args()
+
+    workdir = args.dir or tempfile.mkdtemp()
+    os.makedirs(workdir, exist_ok=True)
+    primary_path = os.path.join(workdir, "primary.sqlite")
+    replica_path = os.path.join(workdir, "replica.sqlite")
+    os.environ.update({
+        "DB_DIALECT": "sqlite",
+        "DB_PATH": primary_path,
+        "DB_LOGGING": "false",
+        "DB_MIGRATION_MODE": "check",
+        "DB_REPLICA_URLS": json.dumps([f"sqlite+aiosqlite:///{replica_path}"]),
+    })
+    os.chdir(BASE_DIR)
+
+    for path in (primary_path, replica_path):
+        build(path)
+    with sqlite3.connect(primary_path) as conn:
+        conn.execute("INSERT INTO research_items (title, user_id, subtype_id, status, content_json) "
+                     "VALUES ('primary only', 1, 1, 'pending', '{}')")
+
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.db.replicas import STICKY_HEADER, ReplicaRouter, replica_router
+    from app.main import app
+
+    failed = 0
+
+    def check(label, ok, detail=""):
+        nonlocal failed
+        failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'}  {label}" + (f": {detail}" if not ok and detail else ""))
+
+    with TestClient(app) as client:
+        login = client.post("/api/v1/login/access-token",
+                            data={"username": "admin@example.com", "password": PASSWORD})
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        def served_by(extra=None):
+            titles = {row["title"] for row in client.get("/api/v1/research/all", headers={**auth, **(extra or {})}).json()}
+            return "primary" if "primary only" in titles else "replica"
+
+        check("reads without a token go to the replica", served_by() == "replica")
+
+        created = client.post("/api/v1/research/", headers=auth,
+                              json={"title": "written", "subtypeId": 1, "contentJson": {}})
+        token = created.headers.get(STICKY_HEADER)
+        check("a write returns X-Primary-Until", created.status_code < 400 and bool(token),
+              f"status {created.status_code}")
+        check("reads echoing the token go to the primary", served_by({STICKY_HEADER: token or ""}) == "primary")
+
+        other_worker = ReplicaRouter(settings.DB_REPLICA_STICKY_SECONDS, settings.DB_REPLICA_RETRY_SECONDS,
+                                     settings.SECRET_KEY)
+        check("another worker accepts the token", other_worker.reads_primary(token))
+
+        until, _, signature = (token or "0.").partition(".")
+        tampered = f"{int(until or 0) + 3600}.{signature}"
+        expired = replica_router.write_token(now=0)
+        check("a tampered token is ignored", served_by({STICKY_HEADER: tampered}) == "replica")
+        check("an expired token is ignored", served_by({STICKY_HEADER: expired}) == "replica")
+
+        for engine in replica_router.engines:
+            replica_router.mark_down(engine)
+        check("reads fall back to the primary while the replica is down", served_by() == "primary")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Check that the hot list queries are served by their indexes on SQLite.
+
+Compiles the queries behind "my items", "pending items", category lists,
+"my notices" and the audit log time range, runs EXPLAIN QUERY PLAN on each
+and fails when a plan does not use the expected index or scans the table
+(or a whole index of it). By default the schema is built in memory from the
+models; pass --db to check an existing SQLite database (e.g. after `alembic
+upgrade head`) instead.
+
+    python scripts/explain_indexes.py [--db app.db] [--verbose]
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy import create_engine, select, update  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.crud.crud_research_item import research_item  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.audit_log import AuditLog  # noqa: E402
+from app.models.notice import Notice  # noqa: E402
+from app.models.notice_recipient import NoticeRecipient  # noqa: E402
+from app.models.research_collaborator import ResearchCollaborator  # noqa: E402
+from app.models.research_item import ApprovalStatus, ResearchItem  # noqa: E402
+from app.models.research_type import ResearchSubtype  # noqa: E402
+
+
+def checks():
+    """(label, statement, indexes the plan must use, tables it must not scan)."""
+    mine = research_item.ids_for_user(2, after=500, limit=100)
+    since = datetime(2026, 1, 1)
+    return [
+        (
+            "my items (owner)",
+            select(ResearchItem.id).where(ResearchItem.user_id == 2).order_by(ResearchItem.id).limit(100),
+            ["ix_research_items_user_id_id"], ["research_items"],
+        ),
+        (
+            "my items (owner or collaborator)",
+            select(ResearchItem.id, mine.c.relation)
+            .join(mine, mine.c.item_id == ResearchItem.id)
+            .order_by(ResearchItem.id).limit(100),
+            ["ix_research_items_user_id_id", "ix_research_collaborators_user_item"],
+            ["research_items", "research_collaborators"],
+        ),
+        (
+            "pending items",
+            select(ResearchItem.id)
+            .where(ResearchItem.status == ApprovalStatus.pending)
+            .order_by(ResearchItem.id).limit(100),
+            ["ix_research_items_status_id"], ["research_items"],
+        ),
+        (
+            "my items by category",
+            select(ResearchItem.id)
+            .join(ResearchSubtype, ResearchSubtype.id == ResearchItem.subtype_id)
+            .where(ResearchItem.user_id == 2, ResearchSubtype.name.like("%论文%"))
+            .order_by(ResearchItem.id).limit(100),
+            ["ix_research_items_user_id_id"], ["research_items"],
+        ),
+        (
+            "items of a subtype (foreign key check)",
+            select(ResearchItem.id).where(ResearchItem.subtype_id == 1).limit(1),
+            ["ix_research_items_subtype_id"], ["research_items"],
+        ),
+        (
+            "collaborators of items",
+            select(ResearchCollaborator.user_id).where(ResearchCollaborator.item_id.in_([1, 2, 3])),
+            ["ix_research_collaborators_item_user"], ["research_collaborators"],
+        ),
+        (
+            "my notices",
+            select(Notice.id)
+            .join(NoticeRecipient, NoticeRecipient.notice_id == Notice.id)
+            .where(NoticeRecipient.user_id == 2),
+            ["ix_notice_recipients_user_notice"], ["notice_recipients"],
+        ),
+        (
+            "mark notices read",
+            update(NoticeRecipient)
+            .where(NoticeRecipient.user_id == 2, NoticeRecipient.notice_id.in_([1, 2]))
+            .values(is_read=True),
+            ["ix_notice_recipients_user_notice"], ["notice_recipients"],
+        ),
+        (
+            "audit logs by time",
+            select(AuditLog.id)
+            .where(AuditLog.created_at >= since, AuditLog.created_at < since + timedelta(days=30))
+            .order_by(AuditLog.created_at.desc()).limit(100),
+            ["ix_audit_logs_created_at"], ["audit_logs"],
+        ),
+    ]
+
+
+def plan(conn, stmt):
+    sql = str(stmt.compile(conn, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+
+
+def problems(details, indexes, tables):
+    found = []
+    for index in indexes:
+        if not any(f"INDEX {index}" in d for d in details):
+            found.append(f"does not use {index}")
+    for table in tables:
+        if any(d.startswith(f"SCAN {table}") for d in details):
+            found.append(f"scans {table}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", help="existing SQLite database file (default: schema from the models, in memory)")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}" if args.db else "sqlite://")
+    failed = 0
+    with engine.connect() as conn:
+        if not args.db:
+            Base.metadata.create_all(conn)
+        for label, stmt, indexes, tables in checks():
+            details = plan(conn, stmt)
+            found = problems(details, indexes, tables)
+            failed += bool(found)
+            print(f"{'FAIL' if found else 'ok  '}  {label}" + (f": {'; '.join(found)}" if found else ""))
+            if found or args.verbose:
+                for d in details:
+                    print(f"        {d}")
+    engine.dispose()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
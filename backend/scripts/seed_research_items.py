@@ -11,7 +11,7 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, init_engine
 from app.models.user import User
 from app.models.research_item import ResearchItem, ApprovalStatus
 from app.models.research_type import ResearchSubtype, ResearchType
@@ -58,6 +58,7 @@ def random_date(start_days_ago=400, end_days_ago=0):
     return base.strftime("%Y-%m-%d")
 
 async def seed_for_teachers():
+    init_engine()
     async with AsyncSessionLocal() as session:
         v_id, h_id = await ensure_subtypes(session)
         # Get all teachers
@@ -30,14 +30,27 @@ function resolveApiBase(): string {
 
 const API_BASE_URL = resolveApiBase();
 
+// After a write the backend returns a signed X-Primary-Until token; sending it back
+// keeps this client's reads on the primary database until it expires.
+const PRIMARY_UNTIL_KEY = 'primaryUntil';
+
+function getPrimaryUntil(): string | null {
+  const value = localStorage.getItem(PRIMARY_UNTIL_KEY);
+  if (value && Number(value.split('.')[0]) * 1000 > Date.now()) return value;
+  if (value) localStorage.removeItem(PRIMARY_UNTIL_KEY);
+  return null;
+}
+
 // Helper function for API requests
 async function apiRequest<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
   const token = localStorage.getItem('token');
+  const primaryUntil = getPrimaryUntil();
   
   const headers = {
     'Content-Type': 'application/json',
     ...options.headers,
-    ...(token ? { Authorization: `Bearer ${token}` } : {})
+    ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    ...(primaryUntil ? { 'X-Primary-Until': primaryUntil } : {})
   } as Record<string, string>;
   const url = `${API_BASE_URL}${endpoint}`;
   
@@ -53,6 +66,11 @@ async function apiRequest<T>(endpoint: string, options: RequestInit = {}): Promi
         cache: 'no-store' // Prevent caching to ensure we hit the live backend
       });
 
+      const nextPrimaryUntil = response.headers.get('X-Primary-Until');
+      if (nextPrimaryUntil) {
+        try { localStorage.setItem(PRIMARY_UNTIL_KEY, nextPrimaryUntil); } catch (_) {}
+      }
+
       if (!response.ok) {
         // Auto-recover: clear invalid token on 401/403 to avoid stuck state
         if (response.status === 401 || response.status === 403) {
@@ -130,8 +148,11 @@ function normalizeUser(raw: any): any {
 function normalizeResearchItem(raw: any, usersCache?: Record<string, string>): any {
   if (!raw || typeof raw !== 'object') return raw;
   const id = raw.id != null ? String(raw.id) : '';
-  const authorId = raw.user_id != null ? String(raw.user_id) : '';
-  const authorName = (usersCache && usersCache[authorId]) || raw.authorName || '';
+  const userId = raw.user_id ?? raw.userId;
+  const authorId = userId != null ? String(userId) : '';
+  const authorName = (usersCache && usersCache[authorId]) || raw.authorName || raw.ownerName || '';
+  const contentJson = raw.content_json ?? raw.contentJson;
+  const createdAt = raw.created_at ?? raw.createdAt;
   const subtypeId = raw.subtype_id;
   const sLower = String(raw.status || '').toLowerCase().trim();
   const status =
@@ -140,7 +161,7 @@ function normalizeResearchItem(raw: any, usersCache?: Record<string, string>): a
     sLower === 'pending' ? 'Pending' :
     sLower === 'draft' ? 'Draft' :
     (raw.status || 'Draft');
-  const date = raw.date || (raw.created_at ? String(raw.created_at).substring(0, 10) : '');
+  const date = raw.date || (createdAt ? String(createdAt).substring(0, 10) : '');
   let category = raw.category;
   if (!category) {
     // Simple mapping by subtype id, aligned with RESEARCH_SUBTYPES db_id hints
@@ -148,7 +169,7 @@ function normalizeResearchItem(raw: any, usersCache?: Record<string, string>): a
     else if (subtypeId === 2) category = '学术论文';
     else if (subtypeId === 3) category = '专利';
     else {
-      const src = raw?.content_json?.source;
+      const src = contentJson?.source;
       if (typeof src === 'string') {
         if (src.includes('校企合作') || src.includes('地方政府项目')) category = '横向项目';
         else if (src.includes('国家自然科学基金') || src.includes('科技部') || src.includes('教育部')) category = '纵向项目';
@@ -163,7 +184,7 @@ function normalizeResearchItem(raw: any, usersCache?: Record<string, string>): a
     category,
     date,
     status,
-    content_json: raw.content_json,
+    content_json: contentJson,
     audit_remarks: raw.audit_remarks,
     teamMembers: raw.teamMembers || raw.collaborators?.map((c: any) => c.user_name) || [],
   };
@@ -251,10 +272,12 @@ export const usersAPI = {
 
 // Research API
 export const researchAPI = {
-  getAll: () => apiRequest<any[]>("/research").then(arr => Array.isArray(arr) ? arr.map(it => normalizeResearchItem(it)) : []),
+  // Teacher lists default to view=summary (no content_json); getById loads one item in full
+  getAll: (view: 'summary' | 'full' = 'summary') => apiRequest<any[]>(`/research?view=${view}`).then(arr => Array.isArray(arr) ? arr.map(it => normalizeResearchItem(it)) : []),
   getAllAdmin: () => apiRequest<any[]>("/research/all").then(arr => Array.isArray(arr) ? arr.map(it => normalizeResearchItem(it)) : []),
   
-  getByUserId: (userId: string) => apiRequest<any[]>(`/research/user/${userId}`).then(arr => Array.isArray(arr) ? arr.map(it => normalizeResearchItem(it)) : []),
+  getByUserId: (userId: string, view: 'summary' | 'full' = 'summary') => apiRequest<any[]>(`/research/user/${userId}?view=${view}`).then(arr => Array.isArray(arr) ? arr.map(it => normalizeResearchItem(it)) : []),
+  getById: (id: string) => apiRequest<any>(`/research/${id}`).then(it => normalizeResearchItem(it)),
   getByCategory: (category: string) => apiRequest<any[]>(`/research/category/${encodeURIComponent(category)}`).then(arr => Array.isArray(arr) ? arr.map(it => normalizeResearchItem(it)) : []),
   categories: () => apiRequest<any[]>(`/research/categories`),
   
@@ -316,6 +339,8 @@ export const noticeAPI = {
     apiRequest<any>("/notices/", { method: 'POST', body: JSON.stringify(data) }),
   my: () => apiRequest<any[]>("/notices/mine"),
   markRead: (id: string | number) => apiRequest<any>(`/notices/${id}/read`, { method: 'PUT' }),
+  markAllRead: (ids?: (string | number)[], allBefore?: string) =>
+    apiRequest<any>("/notices/read", { method: 'PUT', body: JSON.stringify({ ids: ids?.map(Number), allBefore }) }),
 };
 
 export const departmentAPI = {
@@ -324,6 +349,7 @@ export const departmentAPI = {
     const res = await apiRequest<any>(`/departments/normalize?name=${encodeURIComponent(name)}`);
     return res?.code || null;
   },
+  suggest: (q: string, limit = 5) => apiRequest<any[]>(`/departments/suggest?q=${encodeURIComponent(q)}&limit=${limit}`),
   create: (code: string, name: string) => apiRequest<any>("/departments", { method: 'POST', body: JSON.stringify({ code, name }) }),
   update: (code: string, name: string) => apiRequest<any>(`/departments/${code}`, { method: 'PUT', body: JSON.stringify({ name }) }),
   delete: (code: string) => apiRequest<any>(`/departments/${code}`, { method: 'DELETE' }),